@@ -4,14 +4,17 @@ from __future__ import annotations
 import argparse
 import json
 import os
+from typing import NoReturn
 
 import httpx
 
+DEFAULT_GATEWAY = "http://127.0.0.1:8000"
+DEFAULT_API_KEY = os.getenv("OPENCOMMOTION_GATEWAY_API_KEY", "dev-opencommotion-key")
+DEFAULT_CODEX_BIN = os.getenv("OPENCOMMOTION_CODEX_BIN", "codex")
+DEFAULT_CODEX_MODEL = os.getenv("OPENCOMMOTION_CODEX_MODEL", "")
 
-def _request_json(client: httpx.Client, method: str, url: str, op: str, **kwargs) -> dict:
-    response = client.request(method, url, **kwargs)
-    if response.is_success:
-        return response.json()
+
+def _raise_http_error(response: httpx.Response, op: str) -> NoReturn:
     detail = response.text
     try:
         payload = response.json()
@@ -22,24 +25,36 @@ def _request_json(client: httpx.Client, method: str, url: str, op: str, **kwargs
     raise RuntimeError(f"{op} failed ({response.status_code}): {detail}")
 
 
+def _request_json(client: httpx.Client, method: str, url: str, op: str, **kwargs) -> dict:
+    response = client.request(method, url, **kwargs)
+    if 200 <= response.status_code < 300:
+        return response.json()
+    _raise_http_error(response, op)
+
+
+def build_session(gateway: str, api_key: str) -> tuple[str, dict[str, str]]:
+    headers = {"x-api-key": api_key, "content-type": "application/json"} if api_key else {"content-type": "application/json"}
+    return gateway.rstrip("/"), headers
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="OpenCommotion turn client configured for codex-cli provider")
-    parser.add_argument("--gateway", default="http://127.0.0.1:8000")
+    parser.add_argument("--gateway", default=DEFAULT_GATEWAY)
     parser.add_argument("--session", default="codex-cli-demo")
     parser.add_argument("--prompt", default="moonwalk adoption chart with concise narration")
-    parser.add_argument("--api-key", default=os.getenv("OPENCOMMOTION_GATEWAY_API_KEY", "dev-opencommotion-key"))
-    parser.add_argument("--codex-bin", default=os.getenv("OPENCOMMOTION_CODEX_BIN", "codex"))
-    parser.add_argument("--codex-model", default=os.getenv("OPENCOMMOTION_CODEX_MODEL", ""))
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY)
+    parser.add_argument("--codex-bin", default=DEFAULT_CODEX_BIN)
+    parser.add_argument("--codex-model", default=DEFAULT_CODEX_MODEL)
     parser.add_argument("--skip-setup", action="store_true")
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    gateway = args.gateway.rstrip("/")
-    headers = {"x-api-key": args.api_key, "content-type": "application/json"} if args.api_key else {"content-type": "application/json"}
+    gateway, headers = build_session(args.gateway, args.api_key)
 
-    with httpx.Client(timeout=30.0) as client:
+    with httpx.Client(timeout=30.0, headers=headers) as client:
+        # Setup switches the provider that orchestrate runs on, so it must finish first.
         if not args.skip_setup:
             setup_payload = {
                 "values": {
@@ -53,7 +68,6 @@ def main() -> None:
                 "POST",
                 f"{gateway}/v1/setup/state",
                 "setup",
-                headers=headers,
                 json=setup_payload,
             )
 
@@ -62,7 +76,6 @@ def main() -> None:
             "POST",
             f"{gateway}/v2/orchestrate",
             "orchestrate",
-            headers=headers,
             json={"session_id": args.session, "scene_id": f"scene-{args.session}", "base_revision": 0, "prompt": args.prompt},
         )
 
@@ -7,25 +7,35 @@ import os
 
 import httpx
 
+DEFAULT_GATEWAY = "http://127.0.0.1:8000"
+DEFAULT_API_KEY = os.getenv("OPENCOMMOTION_GATEWAY_API_KEY", "dev-opencommotion-key")
+DEFAULT_OPENCLAW_BIN = os.getenv("OPENCOMMOTION_OPENCLAW_BIN", "openclaw")
+DEFAULT_OPENCLAW_SESSION_PREFIX = os.getenv("OPENCOMMOTION_OPENCLAW_SESSION_PREFIX", "opencommotion")
+
+
+def build_session(gateway: str, api_key: str) -> tuple[str, dict[str, str]]:
+    headers = {"x-api-key": api_key, "content-type": "application/json"} if api_key else {"content-type": "application/json"}
+    return gateway.rstrip("/"), headers
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="OpenCommotion turn client configured for openclaw-cli provider")
-    parser.add_argument("--gateway", default="http://127.0.0.1:8000")
+    parser.add_argument("--gateway", default=DEFAULT_GATEWAY)
     parser.add_argument("--session", default="openclaw-cli-demo")
     parser.add_argument("--prompt", default="ufo landing with pie chart and narrated insight")
-    parser.add_argument("--api-key", default=os.getenv("OPENCOMMOTION_GATEWAY_API_KEY", "dev-opencommotion-key"))
-    parser.add_argument("--openclaw-bin", default=os.getenv("OPENCOMMOTION_OPENCLAW_BIN", "openclaw"))
-    parser.add_argument("--openclaw-session-prefix", default=os.getenv("OPENCOMMOTION_OPENCLAW_SESSION_PREFIX", "opencommotion"))
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY)
+    parser.add_argument("--openclaw-bin", default=DEFAULT_OPENCLAW_BIN)
+    parser.add_argument("--openclaw-session-prefix", default=DEFAULT_OPENCLAW_SESSION_PREFIX)
     parser.add_argument("--skip-setup", action="store_true")
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    gateway = args.gateway.rstrip("/")
-    headers = {"x-api-key": args.api_key, "content-type": "application/json"} if args.api_key else {"content-type": "application/json"}
+    gateway, headers = build_session(args.gateway, args.api_key)
 
-    with httpx.Client(timeout=45.0) as client:
+    with httpx.Client(timeout=45.0, headers=headers) as client:
+        # Setup switches the provider that orchestrate runs on, so it must finish first.
         if not args.skip_setup:
             setup_payload = {
                 "values": {
@@ -34,12 +44,11 @@ def main() -> None:
                     "OPENCOMMOTION_OPENCLAW_SESSION_PREFIX": args.openclaw_session_prefix,
                 }
             }
-            setup = client.post(f"{gateway}/v1/setup/state", headers=headers, json=setup_payload)
+            setup = client.post(f"{gateway}/v1/setup/state", json=setup_payload)
             setup.raise_for_status()
 
         orchestrate = client.post(
             f"{gateway}/v2/orchestrate",
-            headers=headers,
             json={"session_id": args.session, "scene_id": f"scene-{args.session}", "base_revision": 0, "prompt": args.prompt},
         )
         orchestrate.raise_for_status()
@@ -7,35 +7,39 @@ import os
 
 import httpx
 
+DEFAULT_GATEWAY = "http://127.0.0.1:8000"
+DEFAULT_API_KEY = os.getenv("OPENCOMMOTION_GATEWAY_API_KEY", "dev-opencommotion-key")
+DEFAULT_BASE_URL = os.getenv(
+    "OPENCOMMOTION_OPENCLAW_OPENAI_BASE_URL", os.getenv("OPENCOMMOTION_OPENAI_BASE_URL", "http://127.0.0.1:8002/v1")
+)
+DEFAULT_MODEL = os.getenv("OPENCOMMOTION_OPENCLAW_OPENAI_MODEL", os.getenv("OPENCOMMOTION_LLM_MODEL", "Qwen/Qwen2.5-7B-Instruct"))
+DEFAULT_PROVIDER_API_KEY = os.getenv("OPENCOMMOTION_OPENCLAW_OPENAI_API_KEY", os.getenv("OPENCOMMOTION_OPENAI_API_KEY", ""))
+
+
+def build_session(gateway: str, api_key: str) -> tuple[str, dict[str, str]]:
+    headers = {"x-api-key": api_key, "content-type": "application/json"} if api_key else {"content-type": "application/json"}
+    return gateway.rstrip("/"), headers
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="OpenCommotion turn client configured for openclaw-openai provider")
-    parser.add_argument("--gateway", default="http://127.0.0.1:8000")
+    parser.add_argument("--gateway", default=DEFAULT_GATEWAY)
     parser.add_argument("--session", default="openclaw-openai-demo")
     parser.add_argument("--prompt", default="orbiting globe with adoption curve and crisp narration")
-    parser.add_argument("--api-key", default=os.getenv("OPENCOMMOTION_GATEWAY_API_KEY", "dev-opencommotion-key"))
-    parser.add_argument(
-        "--base-url",
-        default=os.getenv("OPENCOMMOTION_OPENCLAW_OPENAI_BASE_URL", os.getenv("OPENCOMMOTION_OPENAI_BASE_URL", "http://127.0.0.1:8002/v1")),
-    )
-    parser.add_argument(
-        "--model",
-        default=os.getenv("OPENCOMMOTION_OPENCLAW_OPENAI_MODEL", os.getenv("OPENCOMMOTION_LLM_MODEL", "Qwen/Qwen2.5-7B-Instruct")),
-    )
-    parser.add_argument(
-        "--provider-api-key",
-        default=os.getenv("OPENCOMMOTION_OPENCLAW_OPENAI_API_KEY", os.getenv("OPENCOMMOTION_OPENAI_API_KEY", "")),
-    )
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--provider-api-key", default=DEFAULT_PROVIDER_API_KEY)
     parser.add_argument("--skip-setup", action="store_true")
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    gateway = args.gateway.rstrip("/")
-    headers = {"x-api-key": args.api_key, "content-type": "application/json"} if args.api_key else {"content-type": "application/json"}
+    gateway, headers = build_session(args.gateway, args.api_key)
 
-    with httpx.Client(timeout=35.0) as client:
+    with httpx.Client(timeout=35.0, headers=headers) as client:
+        # Setup switches the provider that orchestrate runs on, so it must finish first.
         if not args.skip_setup:
             setup_payload = {
                 "values": {
@@ -45,12 +49,11 @@ def main() -> None:
                     "OPENCOMMOTION_OPENCLAW_OPENAI_API_KEY": args.provider_api_key,
                 }
             }
-            setup = client.post(f"{gateway}/v1/setup/state", headers=headers, json=setup_payload)
+            setup = client.post(f"{gateway}/v1/setup/state", json=setup_payload)
             setup.raise_for_status()
 
         orchestrate = client.post(
             f"{gateway}/v2/orchestrate",
-            headers=headers,
             json={"session_id": args.session, "scene_id": f"scene-{args.session}", "base_revision": 0, "prompt": args.prompt},
         )
         orchestrate.raise_for_status()
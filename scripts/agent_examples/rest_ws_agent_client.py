@@ -11,6 +11,25 @@ from urllib.parse import urlencode
 import httpx
 import websockets
 
+try:
+    import uvloop
+except ImportError:  # shipped with uvicorn[standard] on POSIX; other platforms keep the default loop
+    uvloop = None
+
+LOOP_FACTORY = uvloop.new_event_loop if uvloop is not None else None
+# Turn events carry whole voice/patch payloads; allow frames above the 1 MiB websockets default.
+WS_MAX_FRAME_BYTES = 4 * 1024 * 1024
+SEARCH_PREVIEW_ROWS = 5
+
+
+def _format_search_row(row: dict) -> str:
+    title = row.get("title", "untitled")
+    mode = row.get("match_mode", "n/a")
+    score = row.get("score")
+    if type(score) in (float, int):
+        return f"  - {title} [{mode}:{score:.3f}]"
+    return f"  - {title} [{mode}]"
+
 
 @dataclass
 class TurnResult:
@@ -36,7 +55,7 @@ async def run_agent_flow(
     if api_key:
         ws_url = f"{ws_url}?{urlencode({'api_key': api_key})}"
 
-    async with websockets.connect(ws_url) as ws:
+    async with websockets.connect(ws_url, compression=None, max_size=WS_MAX_FRAME_BYTES) as ws:
         await ws.send("ping")
 
         headers = {"x-api-key": api_key} if api_key else {}
@@ -51,6 +70,7 @@ async def run_agent_flow(
             turn_id = turn["turn_id"]
             ws_event = await _wait_for_turn_event(ws=ws, session_id=session_id, turn_id=turn_id, timeout_s=timeout_s)
 
+            # Search runs after save so it can find the artifact this run just saved.
             if save:
                 save_resp = await client.post(
                     f"{gateway}/v1/artifacts/save",
@@ -70,15 +90,9 @@ async def run_agent_flow(
                 )
                 search_resp.raise_for_status()
                 results = search_resp.json().get("results", [])
-                print(f"search results ({len(results)}):")
-                for row in results[:5]:
-                    title = row.get("title", "untitled")
-                    mode = row.get("match_mode", "n/a")
-                    score = row.get("score")
-                    if isinstance(score, (float, int)):
-                        print(f"  - {title} [{mode}:{score:.3f}]")
-                    else:
-                        print(f"  - {title} [{mode}]")
+                lines = [f"search results ({len(results)}):"]
+                lines.extend(_format_search_row(row) for row in results[:SEARCH_PREVIEW_ROWS])
+                print("\n".join(lines))
 
     payload = ws_event.get("payload", {})
     segments = payload.get("voice", {}).get("segments", [])
@@ -100,6 +114,8 @@ async def _wait_for_turn_event(
     turn_id: str,
     timeout_s: float,
 ) -> dict:
+    # Frames that arrive before the REST response are buffered by the socket, so reading only
+    # after orchestrate returns still sees the turn's event.
     async def _recv() -> dict:
         while True:
             message = await ws.recv()
@@ -134,17 +150,18 @@ def build_arg_parser() -> argparse.ArgumentParser:
 
 def main() -> None:
     args = build_arg_parser().parse_args()
-    turn = asyncio.run(
-        run_agent_flow(
-            gateway=args.gateway,
-            session_id=args.session,
-            prompt=args.prompt,
-            api_key=args.api_key,
-            save=not args.no_save,
-            search_query=args.search,
-            timeout_s=args.timeout,
+    with asyncio.Runner(loop_factory=LOOP_FACTORY) as runner:
+        turn = runner.run(
+            run_agent_flow(
+                gateway=args.gateway,
+                session_id=args.session,
+                prompt=args.prompt,
+                api_key=args.api_key,
+                save=not args.no_save,
+                search_query=args.search,
+                timeout_s=args.timeout,
+            )
         )
-    )
 
     print("turn complete:")
     print(f"  session_id: {turn.session_id}")
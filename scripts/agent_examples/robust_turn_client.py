@@ -7,12 +7,24 @@ import json
 import os
 import re
 from dataclasses import dataclass
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit
 
 import httpx
 import websockets
 
-
+try:
+    import uvloop
+except ImportError:  # shipped with uvicorn[standard] on POSIX; other platforms keep the default loop
+    uvloop = None
+
+LOOP_FACTORY = uvloop.new_event_loop if uvloop is not None else None
+# Turn events carry whole voice/patch payloads; allow frames above the 1 MiB websockets default.
+WS_MAX_FRAME_BYTES = 4 * 1024 * 1024
+HEALTH_TIMEOUT_S = 2.0
+JSON_HEADERS = {"content-type": "application/json"}
+# Exponential backoff schedules (seconds); attempts past the end reuse the last, capped delay.
+HEALTH_BACKOFF_S = (0.5, 1.0, 2.0, 3.0)
+REST_BACKOFF_S = (0.6, 1.2, 2.4)
 PROMPT_STOPWORDS = {
     "a",
     "an",
@@ -72,6 +84,10 @@ class ClientConfig:
     search: str
 
 
+def _backoff_delay(schedule: tuple[float, ...], attempt: int) -> float:
+    return schedule[min(attempt, len(schedule)) - 1]
+
+
 def _ws_url(gateway: str, api_key: str) -> str:
     base = gateway.replace("http://", "ws://").replace("https://", "wss://").rstrip("/") + "/v2/events/ws"
     if not api_key:
@@ -79,23 +95,31 @@ def _ws_url(gateway: str, api_key: str) -> str:
     return f"{base}?{urlencode({'api_key': api_key})}"
 
 
-async def wait_for_health(gateway: str, orchestrator: str, attempts: int, api_key: str) -> None:
-    headers = {"x-api-key": api_key} if api_key else {}
-    async with httpx.AsyncClient(timeout=2.0, headers=headers) as client:
-        for attempt in range(1, attempts + 1):
-            ok = False
-            try:
-                g = await client.get(f"{gateway}/health")
-                o = await client.get(f"{orchestrator}/health")
-                ok = g.status_code == 200 and o.status_code == 200
-            except httpx.HTTPError:
-                ok = False
-
-            if ok:
-                return
-
-            delay = min(0.5 * (2 ** (attempt - 1)), 3.0)
-            await asyncio.sleep(delay)
+def _health_urls(*bases: str) -> list[str]:
+    # Gateway and orchestrator may be one origin (e.g. behind a shared proxy); probe each origin once.
+    urls: dict[tuple[str, str | None, int, str], str] = {}
+    for base in bases:
+        parts = urlsplit(base)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port, parts.path.rstrip("/"))
+        urls.setdefault(key, f"{base.rstrip('/')}/health")
+    return list(urls.values())
+
+
+async def wait_for_health(client: httpx.AsyncClient, gateway: str, orchestrator: str, attempts: int) -> None:
+    urls = _health_urls(gateway, orchestrator)
+    for attempt in range(1, attempts + 1):
+        results = await asyncio.gather(
+            *(client.get(url, timeout=HEALTH_TIMEOUT_S) for url in urls),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception) and not isinstance(result, httpx.HTTPError):
+                raise result
+        if all(isinstance(result, httpx.Response) and result.status_code == 200 for result in results):
+            return
+
+        await asyncio.sleep(_backoff_delay(HEALTH_BACKOFF_S, attempt))
 
     raise RuntimeError("health checks did not become ready in time")
 
@@ -109,14 +133,13 @@ async def post_orchestrate_with_retry(
     retries: int,
 ) -> dict:
     last_error: Exception | None = None
+    # Encode once; every retry resends the same bytes.
+    body = json.dumps({"session_id": session_id, "scene_id": scene_id, "base_revision": 0, "prompt": prompt}).encode("utf-8")
     for attempt in range(1, retries + 1):
         try:
-            res = await client.post(
-                f"{gateway}/v2/orchestrate",
-                json={"session_id": session_id, "scene_id": scene_id, "base_revision": 0, "prompt": prompt},
-            )
+            res = await client.post(f"{gateway}/v2/orchestrate", content=body, headers=JSON_HEADERS)
             if res.status_code >= 500 and attempt < retries:
-                await asyncio.sleep(min(0.6 * (2 ** (attempt - 1)), 2.4))
+                await asyncio.sleep(_backoff_delay(REST_BACKOFF_S, attempt))
                 continue
             res.raise_for_status()
             return res.json()
@@ -126,7 +149,7 @@ async def post_orchestrate_with_retry(
                 raise
             if attempt >= retries:
                 break
-            await asyncio.sleep(min(0.6 * (2 ** (attempt - 1)), 2.4))
+            await asyncio.sleep(_backoff_delay(REST_BACKOFF_S, attempt))
 
     if last_error is None:
         raise RuntimeError("unknown orchestrate error")
@@ -139,8 +162,8 @@ async def wait_for_turn_event(
     turn_id: str,
     timeout_s: float,
 ) -> dict:
-    seen: set[tuple[str, str]] = set()
-
+    # Frames that arrive before the REST response are buffered by the socket, so reading only
+    # after orchestrate returns still sees the turn's event.
     async def _recv() -> dict:
         while True:
             raw = await ws.recv()
@@ -148,15 +171,8 @@ async def wait_for_turn_event(
                 event = json.loads(raw)
             except json.JSONDecodeError:
                 continue
-            sid = event.get("session_id")
-            tid = event.get("turn_id")
-            if sid != session_id or tid != turn_id:
-                continue
-            key = (sid, tid)
-            if key in seen:
-                continue
-            seen.add(key)
-            return event
+            if event.get("session_id") == session_id and event.get("turn_id") == turn_id:
+                return event
 
     return await asyncio.wait_for(_recv(), timeout=timeout_s)
 
@@ -165,20 +181,28 @@ async def run(config: ClientConfig) -> None:
     gateway = config.gateway.rstrip("/")
     orchestrator = config.orchestrator.rstrip("/")
 
-    await wait_for_health(
-        gateway=gateway,
-        orchestrator=orchestrator,
-        attempts=config.health_attempts,
-        api_key=config.api_key,
-    )
-
     ws_url = _ws_url(gateway, config.api_key)
     scene_id = f"scene-{config.session_id}"
-    async with websockets.connect(ws_url, ping_interval=10, ping_timeout=10) as ws:
-        await ws.send("ping")
+    headers = {"x-api-key": config.api_key} if config.api_key else {}
+    # One pooled client covers health probes, orchestrate, save, and search so
+    # the gateway connection opened while waiting for health is reused.
+    async with httpx.AsyncClient(timeout=30.0, headers=headers) as client:
+        await wait_for_health(
+            client=client,
+            gateway=gateway,
+            orchestrator=orchestrator,
+            attempts=config.health_attempts,
+        )
+
+        async with websockets.connect(
+            ws_url,
+            ping_interval=10,
+            ping_timeout=10,
+            compression=None,
+            max_size=WS_MAX_FRAME_BYTES,
+        ) as ws:
+            await ws.send("ping")
 
-        headers = {"x-api-key": config.api_key} if config.api_key else {}
-        async with httpx.AsyncClient(timeout=30.0, headers=headers) as client:
             rest_turn = await post_orchestrate_with_retry(
                 client=client,
                 gateway=gateway,
@@ -202,6 +226,7 @@ async def run(config: ClientConfig) -> None:
                 source = "rest-fallback"
                 payload = rest_turn
 
+            # Search runs after save so it can find the artifact this run just saved.
             if config.save:
                 save_res = await client.post(
                     f"{gateway}/v1/artifacts/save",
@@ -226,9 +251,16 @@ async def run(config: ClientConfig) -> None:
     voice_segments = payload.get("voice", {}).get("segments", [])
     voice_uri = voice_segments[0].get("audio_uri", "") if voice_segments else ""
     patch_ops = payload.get("patches", []) or payload.get("legacy_visual_patches", []) or payload.get("visual_patches", [])
-    patch_paths = [str(op.get("path", "")) for op in patch_ops if isinstance(op, dict)]
-    has_chart_patch = any(path.startswith("/charts/") for path in patch_paths)
-    has_actor_patch = any(path.startswith("/actors/") for path in patch_paths)
+    has_chart_patch = False
+    has_actor_patch = False
+    for op in patch_ops:
+        if not isinstance(op, dict):
+            continue
+        path = str(op.get("path", ""))
+        has_chart_patch = has_chart_patch or path.startswith("/charts/")
+        has_actor_patch = has_actor_patch or path.startswith("/actors/")
+        if has_chart_patch and has_actor_patch:
+            break
     text_value = str(payload.get("text", ""))
     text_lower = text_value.lower()
     alignment = _prompt_alignment(config.prompt, text_value)
@@ -284,7 +316,8 @@ def main() -> None:
         save=not args.no_save,
         search=args.search,
     )
-    asyncio.run(run(cfg))
+    with asyncio.Runner(loop_factory=LOOP_FACTORY) as runner:
+        runner.run(run(cfg))
 
 
 if __name__ == "__main__":
@@ -3,13 +3,39 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import mmap
 import os
 import subprocess
 import sys
+from collections.abc import Iterator
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 PROJECT_PLAN_PATH = ROOT / "PROJECT.md"
+IMPLEMENTATION_PREFIXES = (
+    "apps/",
+    "services/",
+    "scripts/",
+    "tests/",
+    "agents/",
+    "deploy/",
+    "docker/",
+    "runtime/",
+    "data/",
+    ".github/workflows/",
+)
+IMPLEMENTATION_ROOTS = frozenset(
+    {
+        ".env.example",
+        "requirements.txt",
+        "package.json",
+        "package-lock.json",
+        "docker-compose.yml",
+        "docker-compose.prod.yml",
+        "Makefile",
+    }
+)
+IMPLEMENTATION_EXTENSIONS = frozenset({".py", ".sh", ".ts", ".tsx", ".js", ".css", ".json", ".yaml", ".yml"})
 
 
 def _git_output(*args: str) -> str:
@@ -44,7 +70,7 @@ def _merge_base(base_ref: str) -> str:
     return _git_output("merge-base", base_ref, "HEAD")
 
 
-def _changed_files(base_ref: str) -> list[str]:
+def _iter_changed_files(base_ref: str) -> Iterator[str]:
     try:
         merge_base = _merge_base(base_ref)
     except RuntimeError:
@@ -54,10 +80,30 @@ def _changed_files(base_ref: str) -> list[str]:
             "project-plan-sync: base ref "
             f"'{base_ref}' not available in this checkout; falling back to '{fallback_base}'."
         )
-    raw = _git_output("diff", "--name-only", f"{merge_base}..HEAD")
-    if not raw:
-        return []
-    return [line.strip() for line in raw.splitlines() if line.strip()]
+    # Stream NUL-delimited paths so callers can stop reading once the outcome is known.
+    process = subprocess.Popen(
+        ["git", "diff", "--name-only", "-z", f"{merge_base}..HEAD"],
+        cwd=str(ROOT),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    assert process.stdout is not None
+    finished = False
+    try:
+        pending = b""
+        for chunk in iter(lambda: process.stdout.read(65536), b""):
+            *paths, pending = (pending + chunk).split(b"\0")
+            for raw in paths:
+                path = os.fsdecode(raw).strip()
+                if path:
+                    yield path
+        finished = True
+    finally:
+        if not finished:
+            process.kill()
+        _, stderr = process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode("utf-8", "replace").strip() or "git command failed")
 
 
 def _is_implementation_file(path: str) -> bool:
@@ -69,43 +115,35 @@ def _is_implementation_file(path: str) -> bool:
     if normalized.endswith(".md"):
         return False
 
-    implementation_prefixes = (
-        "apps/",
-        "services/",
-        "scripts/",
-        "tests/",
-        "agents/",
-        "deploy/",
-        "docker/",
-        "runtime/",
-        "data/",
-        ".github/workflows/",
-    )
-    if any(normalized.startswith(prefix) for prefix in implementation_prefixes):
+    if normalized.startswith(IMPLEMENTATION_PREFIXES):
         return True
 
-    implementation_roots = {
-        ".env.example",
-        "requirements.txt",
-        "package.json",
-        "package-lock.json",
-        "docker-compose.yml",
-        "docker-compose.prod.yml",
-        "Makefile",
-    }
-    if normalized in implementation_roots:
+    if normalized in IMPLEMENTATION_ROOTS:
         return True
 
-    return normalized.endswith((".py", ".sh", ".ts", ".tsx", ".js", ".css", ".json", ".yaml", ".yml"))
+    _, dot, extension = normalized.rpartition(".")
+    return bool(dot) and f".{extension}" in IMPLEMENTATION_EXTENSIONS
 
 
 def _project_updated_date() -> str | None:
     if not PROJECT_PLAN_PATH.exists():
         return None
-    for line in PROJECT_PLAN_PATH.read_text(encoding="utf-8").splitlines():
-        if line.startswith("Updated:"):
-            return line.split(":", 1)[1].strip() or None
-    return None
+    marker = b"Updated:"
+    try:
+        with PROJECT_PLAN_PATH.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            # Only the marker line is decoded; the rest of the plan stays in the page cache.
+            if view[: len(marker)] == marker:
+                start = 0
+            else:
+                start = view.find(b"\n" + marker) + 1
+                if start == 0:
+                    return None
+            end = view.find(b"\n", start)
+            line = view[start : end if end != -1 else len(view)]
+    except ValueError:
+        # mmap refuses empty files.
+        return None
+    return line[len(marker) :].decode("utf-8").strip() or None
 
 
 def main() -> int:
@@ -119,19 +157,27 @@ def main() -> int:
     args = parser.parse_args()
 
     base_ref = _resolve_base_ref(args.base_ref)
+    implementation_changes: list[str] = []
+    plan_changed = False
+    saw_changes = False
     try:
-        changed_files = _changed_files(base_ref)
+        for path in _iter_changed_files(base_ref):
+            saw_changes = True
+            if path == "PROJECT.md":
+                plan_changed = True
+            elif _is_implementation_file(path):
+                implementation_changes.append(path)
+            if plan_changed and implementation_changes:
+                # Only the Updated: date check remains; the rest of the diff is irrelevant.
+                break
     except RuntimeError as exc:
         print(f"project-plan-sync: unable to compute change set from '{base_ref}': {exc}")
         return 1
 
-    if not changed_files:
+    if not saw_changes:
         print("project-plan-sync: no changed files detected; skipping.")
         return 0
 
-    implementation_changes = [path for path in changed_files if _is_implementation_file(path)]
-    plan_changed = "PROJECT.md" in changed_files
-
     if implementation_changes and not plan_changed:
         print("project-plan-sync: implementation files changed but PROJECT.md was not updated.")
         for path in implementation_changes:
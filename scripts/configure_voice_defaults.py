@@ -10,55 +10,68 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from services.config.runtime_config import ENV_PATH, parse_env, write_env
+# Resolved once at import; ROOT itself is already a resolved path.
+# normcase keeps the prefix test case-insensitive on Windows, like Path.relative_to.
+_ROOT_STR = os.path.normcase(str(ROOT))
+_ROOT_PREFIX = _ROOT_STR.rstrip(os.sep) + os.sep
+RUNTIME_UI_DIST_REL = "runtime/ui-dist"
+RUNTIME_UI_DIST_ABS = (ROOT / RUNTIME_UI_DIST_REL).resolve()
+LEGACY_UI_DIST = (ROOT / "apps" / "ui" / "dist").resolve()
+# Spellings that are known without resolving to name the legacy dist dir.
+_LEGACY_UI_DIST_STRINGS = frozenset({"apps/ui/dist", str(ROOT / "apps" / "ui" / "dist")})
+PATH_OVERRIDE_DEFAULTS = {
+    "OPENCOMMOTION_UI_DIST_ROOT": ROOT / "runtime" / "ui-dist",
+    "OPENCOMMOTION_AUDIO_ROOT": ROOT / "data" / "audio",
+    "ARTIFACT_DB_PATH": ROOT / "data" / "artifacts" / "artifacts.db",
+    "ARTIFACT_BUNDLE_ROOT": ROOT / "data" / "artifacts" / "bundles",
+}
+TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+# TTS engine settings that a detected local engine may replace.
+_PIPER_OVERRIDE_STATES = frozenset({"", "tone-fallback", "espeak", "auto"})
+_ESPEAK_OVERRIDE_STATES = frozenset({"", "tone-fallback"})
 
 
 def _truthy(value: str | None) -> bool:
-    return str(value or "").strip().lower() in {"1", "true", "yes", "on"}
+    if not value:
+        return False
+    return value.strip().lower() in TRUE_VALUES
 
 
 def _normalize_path_overrides(values: dict[str, str]) -> bool:
     if _truthy(os.getenv("OPENCOMMOTION_ALLOW_EXTERNAL_PATHS")):
         return False
 
-    defaults = {
-        "OPENCOMMOTION_UI_DIST_ROOT": ROOT / "runtime" / "ui-dist",
-        "OPENCOMMOTION_AUDIO_ROOT": ROOT / "data" / "audio",
-        "ARTIFACT_DB_PATH": ROOT / "data" / "artifacts" / "artifacts.db",
-        "ARTIFACT_BUNDLE_ROOT": ROOT / "data" / "artifacts" / "bundles",
-    }
-
     changed = False
-    root_resolved = ROOT.resolve()
-    for key, default_path in defaults.items():
+    for key, default_path in PATH_OVERRIDE_DEFAULTS.items():
         raw = values.get(key, "").strip()
         if not raw:
             continue
         candidate = Path(raw).expanduser()
         if not candidate.is_absolute():
             continue
-        try:
-            candidate.resolve().relative_to(root_resolved)
+        resolved = os.path.normcase(str(candidate.resolve()))
+        if resolved == _ROOT_STR or resolved.startswith(_ROOT_PREFIX):
             continue
-        except ValueError:
-            values[key] = str(default_path)
-            changed = True
+        values[key] = str(default_path)
+        changed = True
     return changed
 
 
 def main() -> int:
-    if not ENV_PATH.exists():
+    # Same file as runtime_config.ENV_PATH; checked first so fresh installs skip the import.
+    if not (ROOT / ".env").exists():
         return 0
 
+    from services.config.runtime_config import ENV_PATH, parse_env, write_env
+
     values = parse_env(ENV_PATH)
     changed = False
 
     ui_dist_raw = values.get("OPENCOMMOTION_UI_DIST_ROOT", "").strip()
-    legacy_ui_dist = (ROOT / "apps" / "ui" / "dist").resolve()
-    runtime_ui_dist_rel = "runtime/ui-dist"
-    runtime_ui_dist_abs = (ROOT / runtime_ui_dist_rel).resolve()
-    if not ui_dist_raw:
-        values["OPENCOMMOTION_UI_DIST_ROOT"] = runtime_ui_dist_rel
+    if ui_dist_raw == RUNTIME_UI_DIST_REL:
+        pass
+    elif not ui_dist_raw or ui_dist_raw in _LEGACY_UI_DIST_STRINGS:
+        values["OPENCOMMOTION_UI_DIST_ROOT"] = RUNTIME_UI_DIST_REL
         changed = True
     else:
         candidate = Path(ui_dist_raw).expanduser()
@@ -66,55 +79,56 @@ def main() -> int:
             candidate = (ROOT / candidate).resolve()
         else:
             candidate = candidate.resolve()
-        if candidate == legacy_ui_dist:
-            values["OPENCOMMOTION_UI_DIST_ROOT"] = runtime_ui_dist_rel
+        if candidate == LEGACY_UI_DIST:
+            values["OPENCOMMOTION_UI_DIST_ROOT"] = RUNTIME_UI_DIST_REL
             changed = True
-        elif candidate == runtime_ui_dist_abs and ui_dist_raw != runtime_ui_dist_rel:
-            values["OPENCOMMOTION_UI_DIST_ROOT"] = runtime_ui_dist_rel
+        elif candidate == RUNTIME_UI_DIST_ABS and ui_dist_raw != RUNTIME_UI_DIST_REL:
+            values["OPENCOMMOTION_UI_DIST_ROOT"] = RUNTIME_UI_DIST_REL
             changed = True
 
     if _normalize_path_overrides(values):
         changed = True
 
-    piper_bin = values.get("OPENCOMMOTION_PIPER_BIN", "").strip() or os.getenv("OPENCOMMOTION_PIPER_BIN_HINT", "").strip()
+    env_piper_bin = values.get("OPENCOMMOTION_PIPER_BIN", "").strip()
+    env_piper_model = values.get("OPENCOMMOTION_PIPER_MODEL", "").strip()
+    env_espeak_bin = values.get("OPENCOMMOTION_ESPEAK_BIN", "").strip()
+    current_tts = values.get("OPENCOMMOTION_TTS_ENGINE", "").strip().lower()
+    current_stt = values.get("OPENCOMMOTION_STT_ENGINE", "").strip()
+
+    piper_bin = env_piper_bin or os.getenv("OPENCOMMOTION_PIPER_BIN_HINT", "").strip()
     if piper_bin:
         piper_bin = shutil.which(piper_bin) or piper_bin
     else:
         piper_bin = shutil.which("piper") or ""
 
-    piper_model = values.get("OPENCOMMOTION_PIPER_MODEL", "").strip() or os.getenv("OPENCOMMOTION_PIPER_MODEL_HINT", "").strip()
-    piper_ready = bool(piper_bin and piper_model and Path(piper_model).is_file())
+    piper_model = env_piper_model or os.getenv("OPENCOMMOTION_PIPER_MODEL_HINT", "").strip()
+    piper_model_ok = bool(piper_model) and Path(piper_model).is_file()
+    piper_ready = bool(piper_bin) and piper_model_ok
 
     espeak_bin = os.getenv("OPENCOMMOTION_ESPEAK_BIN_HINT", "").strip()
     if not espeak_bin:
         espeak_bin = shutil.which("espeak-ng") or shutil.which("espeak") or ""
 
-    current_tts = values.get("OPENCOMMOTION_TTS_ENGINE", "").strip().lower()
-    if piper_ready and current_tts in {"", "tone-fallback", "espeak", "auto"}:
+    if piper_ready and current_tts in _PIPER_OVERRIDE_STATES:
         values["OPENCOMMOTION_TTS_ENGINE"] = "piper"
         changed = True
-    elif espeak_bin and current_tts in {"", "tone-fallback"}:
+    elif espeak_bin and current_tts in _ESPEAK_OVERRIDE_STATES:
         values["OPENCOMMOTION_TTS_ENGINE"] = "espeak"
         changed = True
 
-    if piper_bin and not values.get("OPENCOMMOTION_PIPER_BIN", "").strip():
-        values["OPENCOMMOTION_PIPER_BIN"] = piper_bin
-        changed = True
-
-    if piper_model and Path(piper_model).is_file() and not values.get("OPENCOMMOTION_PIPER_MODEL", "").strip():
-        values["OPENCOMMOTION_PIPER_MODEL"] = piper_model
-        changed = True
-
-    if espeak_bin and not values.get("OPENCOMMOTION_ESPEAK_BIN", "").strip():
-        values["OPENCOMMOTION_ESPEAK_BIN"] = espeak_bin
-        changed = True
-
-    if not values.get("OPENCOMMOTION_STT_ENGINE", "").strip():
-        values["OPENCOMMOTION_STT_ENGINE"] = "auto"
-        changed = True
+    # (key, detected value, value already in .env): fill in only keys the user left empty.
+    defaults = (
+        ("OPENCOMMOTION_PIPER_BIN", piper_bin, env_piper_bin),
+        ("OPENCOMMOTION_PIPER_MODEL", piper_model if piper_model_ok else "", env_piper_model),
+        ("OPENCOMMOTION_ESPEAK_BIN", espeak_bin, env_espeak_bin),
+        ("OPENCOMMOTION_STT_ENGINE", "auto", current_stt),
+    )
+    for key, detected, existing in defaults:
+        if detected and not existing:
+            values[key] = detected
+            changed = True
 
-    if changed:
-        write_env(ENV_PATH, values)
+    if changed and write_env(ENV_PATH, values):
         print("Updated .env defaults for runtime paths and spoken local TTS.")
     return 0
 
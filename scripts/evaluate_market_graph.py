@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import functools
 import json
 import os
 import sys
@@ -14,8 +16,6 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 os.chdir(PROJECT_ROOT)
 
-from services.agents.visual.quality import evaluate_market_growth_scene
-
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Evaluate market-growth graph compatibility for an orchestrated turn.")
@@ -30,6 +30,17 @@ def parse_args() -> argparse.Namespace:
         ),
         help="Prompt to evaluate.",
     )
+    parser.add_argument(
+        "--prompts-file",
+        default=None,
+        help="Evaluate every non-empty line of this file as a prompt, reusing one client (prints a JSON list).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Evaluate each prompt this many times over the same pooled connection (prints a JSON list).",
+    )
     parser.add_argument(
         "--inprocess",
         action="store_true",
@@ -38,70 +49,98 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def _inprocess_turn(payload: dict) -> tuple[int, dict]:
+@functools.lru_cache(maxsize=1)
+def _inprocess_client():
     from fastapi.testclient import TestClient
 
     from services.gateway.app import main as gateway_main
     from services.orchestrator.app.main import app as orchestrator_app
 
-    original_async_client = gateway_main.httpx.AsyncClient
+    # Route the gateway's orchestrator calls in-process; patch only once so wrappers never stack.
+    if not getattr(gateway_main.httpx.AsyncClient, "_routed", False):
+        original_async_client = gateway_main.httpx.AsyncClient
+
+        class RoutedAsyncClient:
+            _routed = True
 
-    class RoutedAsyncClient:
-        def __init__(self, *args, **kwargs) -> None:
-            timeout = kwargs.get("timeout", 20)
-            self._client = original_async_client(
-                timeout=timeout,
-                transport=gateway_main.httpx.ASGITransport(app=orchestrator_app),
-                base_url="http://127.0.0.1:8001",
-            )
+            def __init__(self, *args, **kwargs) -> None:
+                timeout = kwargs.get("timeout", 20)
+                self._client = original_async_client(
+                    timeout=timeout,
+                    transport=gateway_main.httpx.ASGITransport(app=orchestrator_app),
+                    base_url="http://127.0.0.1:8001",
+                )
 
-        async def __aenter__(self):
-            await self._client.__aenter__()
-            return self._client
+            async def __aenter__(self):
+                await self._client.__aenter__()
+                return self._client
 
-        async def __aexit__(self, exc_type, exc_val, exc_tb):
-            return await self._client.__aexit__(exc_type, exc_val, exc_tb)
+            async def __aexit__(self, exc_type, exc_val, exc_tb):
+                return await self._client.__aexit__(exc_type, exc_val, exc_tb)
 
-    gateway_main.httpx.AsyncClient = RoutedAsyncClient
-    client = TestClient(gateway_main.app)
-    response = client.post("/v1/orchestrate", json=payload)
-    return response.status_code, response.json()
+        gateway_main.httpx.AsyncClient = RoutedAsyncClient
+    return TestClient(gateway_main.app)
+
+
+def _read_prompts(path: str) -> list[str]:
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
 
 
 def main() -> int:
     args = parse_args()
+    if args.repeat < 1:
+        print("--repeat must be at least 1", file=sys.stderr)
+        return 2
     headers = {"content-type": "application/json"}
     if args.api_key:
         headers["x-api-key"] = args.api_key
 
-    payload = {"session_id": args.session, "prompt": args.prompt}
-    if args.inprocess:
-        status_code, turn = _inprocess_turn(payload)
-    else:
-        try:
-            response = httpx.post(
-                f"{args.base_url.rstrip('/')}/v1/orchestrate",
-                headers=headers,
-                json=payload,
-                timeout=60,
-            )
-        except Exception as exc:  # noqa: BLE001
-            print(f"request failed: {exc}", file=sys.stderr)
-            print("tip: rerun with --inprocess to evaluate without a running stack.", file=sys.stderr)
-            return 2
-        status_code = response.status_code
-        turn = response.json() if response.content else {}
-
-    if status_code != 200:
-        print(f"orchestrate failed ({status_code}): {json.dumps(turn)}", file=sys.stderr)
+    batch = bool(args.prompts_file) or args.repeat > 1
+    prompts = _read_prompts(args.prompts_file) if args.prompts_file else [args.prompt]
+    if not prompts:
+        print(f"no prompts found in {args.prompts_file}", file=sys.stderr)
         return 2
-
-    report = turn.get("quality_report")
-    if not isinstance(report, dict):
-        report = evaluate_market_growth_scene(turn.get("visual_patches", []))
-
-    print(json.dumps({"turn_id": turn.get("turn_id"), "quality_report": report}, indent=2))
-    return 0 if bool(report.get("ok")) else 1
+    runs = [prompt for prompt in prompts for _ in range(args.repeat)]
+
+    results: list[dict] = []
+    all_ok = True
+    with contextlib.ExitStack() as stack:
+        # TestClient is an httpx.Client, so both modes share one pooled client for every run.
+        if args.inprocess:
+            client = _inprocess_client()
+        else:
+            client = stack.enter_context(httpx.Client(base_url=args.base_url.rstrip("/"), headers=headers, timeout=60))
+        for index, prompt in enumerate(runs):
+            # Separate sessions keep batched prompts from sharing conversational context.
+            session_id = f"{args.session}-{index + 1}" if batch else args.session
+            try:
+                response = client.post("/v1/orchestrate", json={"session_id": session_id, "prompt": prompt})
+            except Exception as exc:  # noqa: BLE001
+                if args.inprocess:
+                    raise
+                print(f"request failed: {exc}", file=sys.stderr)
+                print("tip: rerun with --inprocess to evaluate without a running stack.", file=sys.stderr)
+                return 2
+            status_code = response.status_code
+            turn = response.json() if response.content else {}
+
+            if status_code != 200:
+                print(f"orchestrate failed ({status_code}): {json.dumps(turn)}", file=sys.stderr)
+                return 2
+
+            report = turn.get("quality_report")
+            if not isinstance(report, dict):
+                # Only needed when the gateway did not attach a report, so import it lazily.
+                from services.agents.visual.quality import evaluate_market_growth_scene
+
+                report = evaluate_market_growth_scene(turn.get("visual_patches", []))
+            all_ok = all_ok and bool(report.get("ok"))
+            result = {"turn_id": turn.get("turn_id"), "quality_report": report}
+            results.append({"prompt": prompt, **result} if batch else result)
+
+    print(json.dumps(results if batch else results[0], indent=2))
+    return 0 if all_ok else 1
 
 
 if __name__ == "__main__":
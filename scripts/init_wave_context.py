@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import argparse
 import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -16,11 +18,11 @@ TEMPLATE_TO_OUTPUT = {
 
 
 def _load_json(path: Path) -> dict:
-    return json.loads(path.read_text())
+    return json.loads(path.read_bytes())
 
 
 def _write_json(path: Path, payload: dict) -> None:
-    path.write_text(json.dumps(payload, indent=2) + "\n")
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
 
 
 def parse_args() -> argparse.Namespace:
@@ -40,34 +42,43 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def main() -> None:
-    args = parse_args()
-    RUN_DIR.mkdir(parents=True, exist_ok=True)
+def _process(template_name: str, output_name: str, run_id: str | None, force: bool) -> tuple[bool, str]:
+    template_path = TEMPLATE_DIR / template_name
+    output_path = RUN_DIR / output_name
 
-    wrote = 0
-    skipped = 0
+    if not template_path.exists():
+        raise FileNotFoundError(f"Template not found: {template_path}")
 
-    for template_name, output_name in TEMPLATE_TO_OUTPUT.items():
-        template_path = TEMPLATE_DIR / template_name
-        output_path = RUN_DIR / output_name
-
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template not found: {template_path}")
-
-        if output_path.exists() and not args.force:
-            print(f"skip {output_path} (already exists, use --force to overwrite)")
-            skipped += 1
-            continue
+    if output_path.exists() and not force:
+        return False, f"skip {output_path} (already exists, use --force to overwrite)"
 
+    if run_id:
         payload = _load_json(template_path)
-        if args.run_id:
-            payload["run_id"] = args.run_id
-
+        payload["run_id"] = run_id
         _write_json(output_path, payload)
-        print(f"wrote {output_path}")
-        wrote += 1
+    else:
+        # Templates are stored in the canonical output format, so no re-serialisation is needed.
+        shutil.copyfile(template_path, output_path)
+    return True, f"wrote {output_path}"
+
+
+def main() -> None:
+    args = parse_args()
+    RUN_DIR.mkdir(parents=True, exist_ok=True)
 
-    print(f"done wrote={wrote} skipped={skipped}")
+    # Each template is independent file I/O, so overlap them; map() keeps report order stable.
+    with ThreadPoolExecutor(max_workers=min(8, len(TEMPLATE_TO_OUTPUT))) as executor:
+        outcomes = list(
+            executor.map(
+                lambda item: _process(item[0], item[1], args.run_id, args.force),
+                TEMPLATE_TO_OUTPUT.items(),
+            )
+        )
+
+    for _, message in outcomes:
+        print(message)
+    wrote = sum(1 for written, _ in outcomes if written)
+    print(f"done wrote={wrote} skipped={len(outcomes) - wrote}")
 
 
 if __name__ == "__main__":
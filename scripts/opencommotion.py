@@ -1,24 +1,51 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import argparse
-import hashlib
+import functools
 import json
 import os
+import re
 import shlex
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from collections.abc import Callable, Iterator
 from pathlib import Path
-from urllib.error import URLError
-from urllib.request import urlopen
+from typing import TYPE_CHECKING, TextIO
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import argparse
+    import http.client
+    import mmap
+
+# Modules only some commands need (argparse, http.client, urllib.request, hashlib,
+# concurrent.futures, mmap, io, signal) are imported inside the helpers that use them: the first
+# five are most of the start-up cost of quick commands like version/where, and a lone command
+# token never builds the parser. re and threading stay above for the port patterns and the HTTP
+# pool lock.
 
 ROOT = Path(__file__).resolve().parents[1]
 UI_SRC_ROOT = ROOT / "apps" / "ui" / "src"
 UI_TRACKED_DIST_ROOT = ROOT / "apps" / "ui" / "dist"
 UI_RUNTIME_DIST_ROOT = ROOT / "runtime" / "ui-dist"
 UI_BUILD_MARKER = UI_RUNTIME_DIST_ROOT / ".opencommotion-build-hash"
+UI_HASH_STATIC_INPUTS = (
+    ROOT / "apps" / "ui" / "index.html",
+    ROOT / "apps" / "ui" / "package.json",
+    ROOT / "package.json",
+    ROOT / "package-lock.json",
+    ROOT / ".env",
+    ROOT / ".env.local",
+    ROOT / ".env.production",
+    ROOT / ".env.development",
+    ROOT / "apps" / "ui" / ".env",
+    ROOT / "apps" / "ui" / ".env.local",
+    ROOT / "apps" / "ui" / ".env.production",
+    ROOT / "apps" / "ui" / ".env.development",
+)
 PIPER_WINDOWS_URL = "https://github.com/rhasspy/piper/releases/download/2023.11.14-2/piper_windows_amd64.zip"
 PIPER_MODEL_URL = "https://huggingface.co/rhasspy/piper-voices/resolve/main/en/en_US/lessac/high/en_US-lessac-high.onnx?download=true"
 PIPER_CONFIG_URL = "https://huggingface.co/rhasspy/piper-voices/resolve/main/en/en_US/lessac/high/en_US-lessac-high.onnx.json?download=true"
@@ -27,51 +54,23 @@ PIPER_MODEL_REL = Path("data/models/piper/en_US-lessac-high.onnx")
 PIPER_CONFIG_REL = Path("data/models/piper/en_US-lessac-high.onnx.json")
 WINDOWS_FIREWALL_PORTS = (8000, 8001, 8010, 8011, 5173)
 WINDOWS_FIREWALL_RULE_PREFIX = "OpenCommotion"
-COMMANDS = [
-    "install",
-    "setup",
-    "run",
-    "dev",
-    "update",
-    "fresh",
-    "down",
-    "preflight",
-    "status",
-    "test",
-    "test-ui",
-    "test-e2e",
-    "test-complete",
-    "fresh-agent-e2e",
-    "voice-setup",
-    "doctor",
-    "quickstart",
-    "version",
-    "where",
-    "uninstall",
-]
-COMMAND_FLAG_ALIASES = {
-    "-install": "install",
-    "-setup": "setup",
-    "-run": "run",
-    "-dev": "dev",
-    "-update": "update",
-    "-fresh": "fresh",
-    "-down": "down",
-    "-stop": "down",
-    "-preflight": "preflight",
-    "-status": "status",
-    "-test": "test",
-    "-test-ui": "test-ui",
-    "-test-e2e": "test-e2e",
-    "-test-complete": "test-complete",
-    "-fresh-agent-e2e": "fresh-agent-e2e",
-    "-voice-setup": "voice-setup",
-    "-doctor": "doctor",
-    "-quickstart": "quickstart",
-    "-version": "version",
-    "-where": "where",
-    "-uninstall": "uninstall",
-}
+UI_HASH_MAX_WORKERS = 16
+# Below this size one read() into a fresh buffer beats the mmap/munmap pair plus page faults.
+UI_HASH_MMAP_MIN_BYTES = 64 * 1024
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+FRESH_REMOVE_MAX_WORKERS = 4
+WINDOWS_NEW_PROCESS_GROUP = getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+_GATEWAY_PORT_RE = re.compile(rb"^GATEWAY_PORT=[ \t]*(\d+)[ \t\r]*$", re.MULTILINE)
+_ORCHESTRATOR_PORT_RE = re.compile(rb"^ORCHESTRATOR_PORT=[ \t]*(\d+)[ \t\r]*$", re.MULTILINE)
+PROBE_CONNECT_TIMEOUT_S = 0.25
+# Health probes only ever target loopback services, which answer /health in milliseconds.
+PROBE_READ_TIMEOUT_S = 1.0
+PROBE_MAX_WORKERS = 8
+_HTTP_POOL: dict[tuple[str, str, int | None], list[http.client.HTTPConnection]] = {}
+_HTTP_POOL_LOCK = threading.Lock()
+_HEAD_UNSUPPORTED: set[tuple[str, str, int | None]] = set()
+_ENV_CACHE: tuple[tuple[int, int] | None, dict[str, str]] | None = None
+_MERGED_ENV: tuple[dict[str, str], dict[str, str]] | None = None
 
 
 def _venv_python() -> str:
@@ -91,6 +90,7 @@ def _venv_python() -> str:
     return sys.executable
 
 
+@functools.lru_cache(maxsize=1)
 def _project_version() -> str:
     package_path = ROOT / "package.json"
     try:
@@ -101,10 +101,39 @@ def _project_version() -> str:
     return version or "0.0.0"
 
 
+def _git_head_revision() -> str | None:
+    # Resolve HEAD from the plain-git layout without spawning git; anything unusual
+    # (worktrees, missing refs) returns None so the caller can ask git itself.
+    git_dir = ROOT / ".git"
+    if not git_dir.is_dir():
+        return None
+    head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    if not head.startswith("ref: "):
+        return head or None
+    ref = head[len("ref: ") :].strip()
+    loose_ref = git_dir / ref
+    if loose_ref.is_file():
+        return loose_ref.read_text(encoding="utf-8").strip() or None
+    packed_refs = git_dir / "packed-refs"
+    if packed_refs.is_file():
+        for line in packed_refs.read_text(encoding="utf-8").splitlines():
+            sha, _, name = line.partition(" ")
+            if name == ref:
+                return sha
+    return None
+
+
+@functools.lru_cache(maxsize=1)
 def _project_revision() -> str:
     env_revision = str(os.getenv("OPENCOMMOTION_BUILD_REVISION", "")).strip()
     if env_revision:
         return env_revision
+    try:
+        revision = _git_head_revision()
+    except (OSError, UnicodeDecodeError):
+        revision = None
+    if revision:
+        return revision[:7]
     try:
         revision = (
             subprocess.check_output(
@@ -120,38 +149,68 @@ def _project_revision() -> str:
     return revision or "dev"
 
 
+@functools.lru_cache(maxsize=1)
 def _project_identity() -> str:
     return f"OpenCommotion {_project_version()} ({_project_revision()})"
 
 
-def _env_with_pythonpath() -> dict[str, str]:
-    env = os.environ.copy()
+def _invalidate_project_identity() -> None:
+    # Version and revision are the only cached filesystem answers (package.json plus a git read or
+    # child process); only a pull in `update` can change them within one CLI run.
+    _project_version.cache_clear()
+    _project_revision.cache_clear()
+    _project_identity.cache_clear()
+
+
+def _env_delta() -> dict[str, str]:
+    """Return only the variables the CLI adds on top of os.environ (.env defaults, PYTHONPATH, UI dirs)."""
+    global _ENV_CACHE
     env_file = ROOT / ".env"
-    if env_file.exists():
-        for raw_line in env_file.read_text(encoding="utf-8").splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if line.startswith("export "):
-                line = line[len("export ") :].strip()
-            if "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            if key:
-                env.setdefault(key, value)
+    try:
+        stat = env_file.stat()
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        fingerprint = None
+    # os.environ is never modified by this script, so the .env fingerprint alone keys the cache.
+    if _ENV_CACHE is not None and _ENV_CACHE[0] == fingerprint:
+        return _ENV_CACHE[1]
+    base = os.environ
+    delta: dict[str, str] = {}
+    if fingerprint is not None:
+        with env_file.open(encoding="utf-8") as handle:
+            for raw_line in handle:
+                line = raw_line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("export "):
+                    line = line[len("export ") :].strip()
+                key, sep, value = line.partition("=")
+                key = key.strip()
+                if sep and key and key not in base and key not in delta:
+                    delta[key] = value.strip().strip('"').strip("'")
     root = str(ROOT)
-    current = env.get("PYTHONPATH", "").strip()
+    current = delta.get("PYTHONPATH", base.get("PYTHONPATH", "")).strip()
     if current:
         parts = [part for part in current.split(":") if part]
         if root not in parts:
-            env["PYTHONPATH"] = f"{root}:{current}"
+            delta["PYTHONPATH"] = f"{root}:{current}"
     else:
-        env["PYTHONPATH"] = root
-    env.setdefault("OPENCOMMOTION_UI_DIST_ROOT", str(UI_RUNTIME_DIST_ROOT))
-    env.setdefault("OPENCOMMOTION_UI_BUILD_OUT_DIR", str(UI_RUNTIME_DIST_ROOT))
-    return env
+        delta["PYTHONPATH"] = root
+    for key in ("OPENCOMMOTION_UI_DIST_ROOT", "OPENCOMMOTION_UI_BUILD_OUT_DIR"):
+        if key not in base and key not in delta:
+            delta[key] = str(UI_RUNTIME_DIST_ROOT)
+    _ENV_CACHE = (fingerprint, delta)
+    return delta
+
+
+def _env_with_pythonpath() -> dict[str, str]:
+    # The merge is computed once per .env revision; each caller gets its own copy so adding
+    # variables for one child never leaks into the next.
+    global _MERGED_ENV
+    delta = _env_delta()
+    if _MERGED_ENV is None or _MERGED_ENV[0] is not delta:
+        _MERGED_ENV = (delta, os.environ | delta)
+    return dict(_MERGED_ENV[1])
 
 
 def _run(command: list[str]) -> int:
@@ -166,8 +225,33 @@ def _run(command: list[str]) -> int:
 
 def _download_file(url: str, target_path: Path) -> None:
     target_path.parent.mkdir(parents=True, exist_ok=True)
-    with urlopen(url, timeout=120) as response:
-        target_path.write_bytes(response.read())
+    # Stream through a .part file so a failed download never leaves a truncated asset that passes .exists().
+    from urllib.request import urlopen
+
+    partial_path = target_path.with_name(target_path.name + ".part")
+    try:
+        with urlopen(url, timeout=120) as response, partial_path.open("wb") as handle:
+            shutil.copyfileobj(response, handle, length=DOWNLOAD_CHUNK_BYTES)
+        os.replace(partial_path, target_path)
+    finally:
+        partial_path.unlink(missing_ok=True)
+
+
+def _download_files(pending: list[tuple[str, Path]]) -> None:
+    # The assets live on different hosts, so fetch them together; the first failure cancels
+    # whatever has not started yet and is re-raised once the running downloads settle.
+    if not pending:
+        return
+    from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+    with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        futures = [executor.submit(_download_file, url, target) for url, target in pending]
+        _, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in not_done:
+            future.cancel()
+    for future in futures:
+        if not future.cancelled():
+            future.result()
 
 
 def _ensure_env_file_exists() -> Path:
@@ -185,30 +269,26 @@ def _ensure_env_file_exists() -> Path:
 def _set_env_values(values: dict[str, str]) -> None:
     env_path = _ensure_env_file_exists()
     original_text = env_path.read_text(encoding="utf-8")
-    source_lines = original_text.splitlines()
-    seen_keys: set[str] = set()
+    pending = dict(values)
     output_lines: list[str] = []
 
-    for line in source_lines:
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#") or "=" not in line:
-            output_lines.append(line)
-            continue
-        key, _ = line.split("=", 1)
+    for line in original_text.splitlines():
+        key, sep, _ = line.partition("=")
         normalized_key = key.strip()
-        if normalized_key in values:
+        # Every occurrence of a key is rewritten; comments never match because of their leading '#'.
+        if sep and normalized_key in values and not normalized_key.startswith("#"):
             output_lines.append(f"{normalized_key}={values[normalized_key]}")
-            seen_keys.add(normalized_key)
+            pending.pop(normalized_key, None)
         else:
             output_lines.append(line)
 
-    missing_keys = [key for key in values if key not in seen_keys]
-    if missing_keys and output_lines and output_lines[-1].strip():
+    if pending and output_lines and output_lines[-1].strip():
         output_lines.append("")
-    for key in missing_keys:
-        output_lines.append(f"{key}={values[key]}")
+    output_lines.extend(f"{key}={value}" for key, value in pending.items())
 
-    env_path.write_text("\n".join(output_lines) + "\n", encoding="utf-8")
+    updated_text = "\n".join(output_lines) + "\n"
+    if updated_text != original_text:
+        env_path.write_text(updated_text, encoding="utf-8")
 
 
 def _verify_piper_engine() -> int:
@@ -226,15 +306,23 @@ def _verify_piper_engine() -> int:
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> str | None:
+    # In-process PATH lookup (no `which`/`where` child), shared by every tool probe in the CLI.
+    return shutil.which(name)
+
+
+@functools.lru_cache(maxsize=1)
 def _npm_executable() -> str | None:
     candidates = ["npm.cmd", "npm.exe", "npm"] if os.name == "nt" else ["npm"]
     for candidate in candidates:
-        resolved = shutil.which(candidate)
+        resolved = _which(candidate)
         if resolved:
             return resolved
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def _bash_executable() -> str:
     if os.name != "nt":
         return "bash"
@@ -245,15 +333,16 @@ def _bash_executable() -> str:
     for candidate in preferred:
         if candidate.exists():
             return str(candidate)
-    resolved = shutil.which("bash")
+    resolved = _which("bash")
     return resolved or "bash"
 
 
-def _vite_entry_candidates() -> list[Path]:
-    return [
+@functools.lru_cache(maxsize=1)
+def _vite_entry_candidates() -> tuple[Path, ...]:
+    return (
         ROOT / "node_modules" / "vite" / "bin" / "vite.js",
         ROOT / "apps" / "ui" / "node_modules" / "vite" / "bin" / "vite.js",
-    ]
+    )
 
 
 def _ui_toolchain_ready() -> bool:
@@ -291,8 +380,7 @@ def _install_ui_dependencies() -> int:
 def cmd_install(*, suppress_next_steps: bool = False) -> int:
     if not suppress_next_steps:
         return _run([_bash_executable(), "scripts/install_local.sh"])
-    env = _env_with_pythonpath()
-    env["OPENCOMMOTION_SUPPRESS_NEXT_STEPS"] = "1"
+    env = _env_with_pythonpath() | {"OPENCOMMOTION_SUPPRESS_NEXT_STEPS": "1"}
     completed = subprocess.run(
         [_bash_executable(), "scripts/install_local.sh"],
         cwd=str(ROOT),
@@ -348,39 +436,150 @@ def cmd_dev() -> int:
     return _run([_bash_executable(), "scripts/dev_up.sh", "--ui-mode", "dev"])
 
 
+def _walk_files(root: str) -> Iterator[str]:
+    # scandir reports entry types from readdir, so only symlinks cost an extra stat. Like rglob,
+    # symlinked directories are not descended into while symlinked files are included.
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+
+
 def _ui_hash_inputs() -> list[Path]:
     files: list[Path] = []
     if UI_SRC_ROOT.exists():
-        files.extend(sorted(p for p in UI_SRC_ROOT.rglob("*") if p.is_file()))
-    static_candidates = [
-        ROOT / "apps" / "ui" / "index.html",
-        ROOT / "apps" / "ui" / "package.json",
-        ROOT / "package.json",
-        ROOT / "package-lock.json",
-        ROOT / ".env",
-        ROOT / ".env.local",
-        ROOT / ".env.production",
-        ROOT / ".env.development",
-        ROOT / "apps" / "ui" / ".env",
-        ROOT / "apps" / "ui" / ".env.local",
-        ROOT / "apps" / "ui" / ".env.production",
-        ROOT / "apps" / "ui" / ".env.development",
-    ]
-    for candidate in static_candidates:
+        # Sorting the plain strings avoids pathlib's per-comparison overhead; Paths are built once.
+        files.extend(map(Path, sorted(_walk_files(str(UI_SRC_ROOT)))))
+    for candidate in UI_HASH_STATIC_INPUTS:
         if candidate.exists():
             files.append(candidate)
     return files
 
 
-def _ui_source_hash() -> str:
-    digest = hashlib.sha256()
-    for path in _ui_hash_inputs():
-        rel = str(path.relative_to(ROOT)).encode("utf-8")
-        digest.update(rel)
+def _map_for_hash(path: Path) -> mmap.mmap | bytes:
+    import mmap
+
+    with path.open("rb", buffering=0) as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size < UI_HASH_MMAP_MIN_BYTES:
+            # Most UI sources are a few KiB; mmap also refuses empty files.
+            return handle.read()
+        try:
+            view = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # The file was truncated after the fstat above.
+            return b""
+    if hasattr(mmap, "MADV_WILLNEED"):
+        # Ask for readahead of the whole file up front instead of faulting pages in one at a time.
+        view.madvise(mmap.MADV_WILLNEED)
+    return view
+
+
+def _ui_rel(path: Path) -> str:
+    # Every input lives under ROOT, so slicing the prefix off the string replaces relative_to(),
+    # which dominated the per-file loops on large trees.
+    return str(path)[len(str(ROOT)) + 1 :].replace(os.sep, "/")
+
+
+def _ui_stat_map(paths: list[Path]) -> dict[str, list[int]]:
+    stat_map: dict[str, list[int]] = {}
+    for path in paths:
+        stat = os.stat(path)
+        stat_map[_ui_rel(path)] = [stat.st_mtime_ns, stat.st_size]
+    return stat_map
+
+
+def _read_build_marker() -> tuple[str, dict[str, list[int]], dict[str, str]]:
+    if not UI_BUILD_MARKER.exists():
+        return "", {}, {}
+    text = UI_BUILD_MARKER.read_text(encoding="utf-8").strip()
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        # Markers from older CLIs hold only the bare hash.
+        return text, {}, {}
+    if not isinstance(payload, dict):
+        return text, {}, {}
+    files = payload.get("files")
+    digests = payload.get("digests")
+    return (
+        str(payload.get("hash", "")),
+        files if isinstance(files, dict) else {},
+        # Reused digests are folded straight into the source hash, so entries that do not decode
+        # are dropped here and those files are rehashed like any other cache miss.
+        {name: value for name, value in digests.items() if _is_file_digest(value)}
+        if isinstance(digests, dict)
+        else {},
+    )
+
+
+def _is_file_digest(value: object) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        return len(bytes.fromhex(value)) == 16
+    except ValueError:
+        return False
+
+
+def _write_build_marker(source_hash: str, files: dict[str, list[int]], digests: dict[str, str]) -> None:
+    UI_BUILD_MARKER.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"hash": source_hash, "files": files, "digests": digests}
+    UI_BUILD_MARKER.write_text(json.dumps(payload) + "\n", encoding="utf-8")
+
+
+@functools.lru_cache(maxsize=1)
+def _ui_file_hasher() -> tuple[str, Callable[[bytes | mmap.mmap], bytes]]:
+    try:
+        from blake3 import blake3
+    except ImportError:  # optional speedup; stdlib blake2b is the fallback
+        import hashlib
+
+        return "blake2b", lambda data: hashlib.blake2b(data, digest_size=16).digest()
+    return "blake3", lambda data: blake3(data).digest(16)
+
+
+def _hash_ui_file(path: Path) -> bytes:
+    data = _map_for_hash(path)
+    try:
+        # Both hashers drop the GIL while digesting larger buffers, so workers hash in parallel.
+        return _ui_file_hasher()[1](data)
+    finally:
+        if not isinstance(data, bytes):
+            data.close()
+
+
+def _ui_source_hash(
+    paths: list[Path] | None = None, known: dict[str, str] | None = None
+) -> tuple[str, dict[str, str]]:
+    import hashlib
+    from concurrent.futures import ThreadPoolExecutor
+
+    if paths is None:
+        paths = _ui_hash_inputs()
+    known = known or {}
+    names = [_ui_rel(path) for path in paths]
+    # Only files without a known digest are read: each is digested on a worker and the per-file
+    # digests are folded here in the sorted input order so the result stays deterministic.
+    # Workers close their own mappings, so at most one per worker is open at a time.
+    digests = {name: known[name] for name in names if name in known}
+    missing = [(name, path) for name, path in zip(names, paths) if name not in digests]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(UI_HASH_MAX_WORKERS, len(missing))) as executor:
+            hashed = executor.map(_hash_ui_file, [path for _, path in missing])
+            digests.update((name, file_digest.hex()) for (name, _), file_digest in zip(missing, hashed))
+    digest = hashlib.blake2b(digest_size=16)
+    for name in names:
+        digest.update(name.encode("utf-8"))
         digest.update(b"\0")
-        digest.update(path.read_bytes())
+        digest.update(bytes.fromhex(digests[name]))
         digest.update(b"\0")
-    return digest.hexdigest()
+    # The per-file algorithm prefixes the hash so switching hashers never matches an old marker.
+    return f"{_ui_file_hasher()[0]}:{digest.hexdigest()}", digests
 
 
 def _seed_runtime_dist_from_tracked() -> bool:
@@ -393,14 +592,43 @@ def _seed_runtime_dist_from_tracked() -> bool:
     UI_RUNTIME_DIST_ROOT.parent.mkdir(parents=True, exist_ok=True)
     if UI_RUNTIME_DIST_ROOT.exists():
         shutil.rmtree(UI_RUNTIME_DIST_ROOT)
-    shutil.copytree(UI_TRACKED_DIST_ROOT, UI_RUNTIME_DIST_ROOT)
-    return (UI_RUNTIME_DIST_ROOT / "index.html").exists()
+    # Hard links make seeding a metadata-only operation. That is safe because nothing edits
+    # the runtime dist in place: vite's emptyOutDir unlinks it before writing a new build.
+    linked = False
+    if os.name != "nt":
+        try:
+            shutil.copytree(UI_TRACKED_DIST_ROOT, UI_RUNTIME_DIST_ROOT, copy_function=os.link)
+            linked = True
+        except OSError:
+            # Cross-device runtime dir or a filesystem without hard links.
+            shutil.rmtree(UI_RUNTIME_DIST_ROOT, ignore_errors=True)
+    if not linked:
+        shutil.copytree(UI_TRACKED_DIST_ROOT, UI_RUNTIME_DIST_ROOT)
+    return runtime_index.exists()
+
+
+def _ui_marker_is_fresh() -> bool:
+    # OPENCOMMOTION_UI_DIST_FRESH_TTL (seconds, default 0 = off) trusts a marker written that
+    # recently without walking the UI tree, for CI jobs that invoke the CLI back to back.
+    try:
+        ttl = float(os.getenv("OPENCOMMOTION_UI_DIST_FRESH_TTL", "") or 0)
+    except ValueError:
+        return False
+    if ttl <= 0:
+        return False
+    try:
+        marker_mtime = UI_BUILD_MARKER.stat().st_mtime
+    except OSError:
+        return False
+    return time.time() - marker_mtime < ttl and (UI_RUNTIME_DIST_ROOT / "index.html").exists()
 
 
 def _ensure_ui_dist_current() -> int:
     if os.getenv("OPENCOMMOTION_SKIP_UI_BUILD", "").strip().lower() in {"1", "true", "yes", "on"}:
         _seed_runtime_dist_from_tracked()
         return 0
+    if _ui_marker_is_fresh():
+        return 0
     if not (ROOT / "apps" / "ui" / "package.json").exists():
         return 0
     npm_exec = _npm_executable()
@@ -417,10 +645,28 @@ def _ensure_ui_dist_current() -> int:
                 return 0
             return deps_code
 
-    source_hash = _ui_source_hash()
-    index_path = UI_RUNTIME_DIST_ROOT / "index.html"
-    previous_hash = UI_BUILD_MARKER.read_text(encoding="utf-8").strip() if UI_BUILD_MARKER.exists() else ""
-    if index_path.exists() and previous_hash == source_hash:
+    # The marker records the content hash of the last build plus each input's (mtime, size) and
+    # digest. Unchanged stats skip hashing entirely; otherwise only inputs whose stats moved are
+    # re-read, and changed stats with unchanged content (checkout, touch) only refresh the
+    # marker. OPENCOMMOTION_UI_HASH_DEEP=1 always re-reads every input.
+    inputs = _ui_hash_inputs()
+    stat_map = _ui_stat_map(inputs)
+    previous_hash, previous_stats, previous_digests = _read_build_marker()
+    index_ready = (UI_RUNTIME_DIST_ROOT / "index.html").exists()
+    deep = os.getenv("OPENCOMMOTION_UI_HASH_DEEP", "").strip().lower() in {"1", "true", "yes", "on"}
+    if index_ready and previous_hash and not deep and previous_stats == stat_map:
+        return 0
+    known: dict[str, str] = {}
+    if not deep and previous_hash.startswith(f"{_ui_file_hasher()[0]}:"):
+        known = {
+            name: file_digest
+            for name, file_digest in previous_digests.items()
+            if name in stat_map and previous_stats.get(name) == stat_map[name]
+        }
+    source_hash, digests = _ui_source_hash(inputs, known)
+    if index_ready and previous_hash == source_hash:
+        if previous_stats != stat_map:
+            _write_build_marker(source_hash, stat_map, digests)
         return 0
 
     print("Building UI assets...")
@@ -450,13 +696,12 @@ def _ensure_ui_dist_current() -> int:
             "chmod +x node_modules/.bin/vite apps/ui/node_modules/.bin/vite 2>/dev/null || true"
         )
         return code
-    UI_BUILD_MARKER.parent.mkdir(parents=True, exist_ok=True)
-    UI_BUILD_MARKER.write_text(source_hash + "\n", encoding="utf-8")
+    _write_build_marker(source_hash, stat_map, digests)
     return 0
 
 
 def _run_ui_build_via_node() -> int:
-    node_bin = shutil.which("node")
+    node_bin = _which("node")
     if node_bin is None:
         return 127
 
@@ -479,19 +724,11 @@ def _read_dev_ports() -> tuple[int, int]:
     ports_file = ROOT / "runtime" / "agent-runs" / "ports.env"
     if not ports_file.exists():
         return 0, 0
-    gw, orch = 0, 0
-    for line in ports_file.read_text(encoding="utf-8").splitlines():
-        if line.startswith("GATEWAY_PORT="):
-            try:
-                gw = int(line.split("=", 1)[1])
-            except ValueError:
-                pass
-        elif line.startswith("ORCHESTRATOR_PORT="):
-            try:
-                orch = int(line.split("=", 1)[1])
-            except ValueError:
-                pass
-    return gw, orch
+    data = ports_file.read_bytes()
+    # Last assignment wins, matching how dev_down.sh sources the file.
+    gw = _GATEWAY_PORT_RE.findall(data)
+    orch = _ORCHESTRATOR_PORT_RE.findall(data)
+    return (int(gw[-1]) if gw else 0), (int(orch[-1]) if orch else 0)
 
 
 def _preferred_app_url(path: str = "") -> str:
@@ -508,41 +745,45 @@ def _preferred_app_url(path: str = "") -> str:
 
 
 def _stack_running() -> bool:
-    # Check production ports (run mode: 8000/8001)
-    gateway_ok, _ = _check_url("http://127.0.0.1:8000/health")
-    orchestrator_ok, _ = _check_url("http://127.0.0.1:8001/health")
-    if gateway_ok or orchestrator_ok:
-        return True
-    # Also check dev ports from ports.env (dev mode: typically 8010/8011)
-    gw_port, orch_port = _read_dev_ports()
-    if gw_port and gw_port not in (8000, 8001):
-        ok, _ = _check_url(f"http://127.0.0.1:{gw_port}/health")
-        if ok:
-            return True
-    if orch_port and orch_port not in (8000, 8001):
-        ok, _ = _check_url(f"http://127.0.0.1:{orch_port}/health")
-        if ok:
-            return True
-    return False
+    # Production ports (run mode: 8000/8001) plus any dev ports from ports.env (typically 8010/8011).
+    urls = ["http://127.0.0.1:8000/health", "http://127.0.0.1:8001/health"]
+    urls.extend(f"http://127.0.0.1:{port}/health" for port in _read_dev_ports() if port and port not in (8000, 8001))
+    # Probe concurrently so closed ports cost one timeout instead of one each. Leaving the block
+    # waits for probes already in flight (each is bounded by the probe timeouts), so a positive
+    # answer still returns after at most one probe round.
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        futures = [executor.submit(_check_url, url) for url in urls]
+        return any(future.result()[0] for future in as_completed(futures))
 
 
 def _cleanup_generated_git_dist_changes() -> None:
-    subprocess.run(
-        ["git", "restore", "--worktree", "--staged", "apps/ui/dist/index.html"],
+    env = _env_with_pythonpath()
+    # Builds go to runtime/ui-dist, so the tracked dist is normally clean. A read-only status
+    # check then replaces both mutating commands (restore rewrites the index under its lock).
+    status = subprocess.run(
+        ["git", "status", "--porcelain", "--untracked-files=all", "--", "apps/ui/dist"],
         cwd=str(ROOT),
         check=False,
-        env=_env_with_pythonpath(),
-        stdout=subprocess.DEVNULL,
+        env=env,
+        stdout=subprocess.PIPE,
         stderr=subprocess.DEVNULL,
     )
-    subprocess.run(
+    if status.returncode == 0 and not status.stdout.strip():
+        return
+    for command in (
+        ["git", "restore", "--worktree", "--staged", "apps/ui/dist/index.html"],
         ["git", "clean", "-fd", "apps/ui/dist/assets"],
-        cwd=str(ROOT),
-        check=False,
-        env=_env_with_pythonpath(),
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
+    ):
+        subprocess.run(
+            command,
+            cwd=str(ROOT),
+            check=False,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
 
 
 def cmd_update() -> int:
@@ -561,6 +802,7 @@ def cmd_update() -> int:
             print("Update pull failed; restarting previous stack state...")
             _ = cmd_run()
         return pull_code
+    _invalidate_project_identity()
 
     print("Installing/updating dependencies...")
     install_code = cmd_install(suppress_next_steps=True)
@@ -582,23 +824,22 @@ def cmd_update() -> int:
     return 0
 
 
-def _safe_remove(path: Path, dry_run: bool) -> None:
+def _safe_remove(path: Path, dry_run: bool) -> str | None:
     try:
         path.relative_to(ROOT)
     except ValueError as exc:
         raise RuntimeError(f"Refusing to remove path outside project root: {path}") from exc
 
     if not path.exists():
-        return
+        return None
     rel = path.relative_to(ROOT)
     if dry_run:
-        print(f"[dry-run] would remove {rel}")
-        return
+        return f"[dry-run] would remove {rel}"
     if path.is_dir():
         shutil.rmtree(path)
     else:
         path.unlink()
-    print(f"removed {rel}")
+    return f"removed {rel}"
 
 
 def cmd_fresh() -> int:
@@ -634,8 +875,14 @@ def cmd_fresh() -> int:
         cleanup_paths.append(ROOT / ".env")
 
     print("Running fresh reset...")
-    for path in cleanup_paths:
-        _safe_remove(path, dry_run=dry_run)
+    # The paths are independent trees and rmtree is bound by unlink syscalls, so the large ones
+    # (.venv and both node_modules) are removed side by side. Messages keep the list order.
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=FRESH_REMOVE_MAX_WORKERS) as executor:
+        for message in executor.map(lambda path: _safe_remove(path, dry_run=dry_run), cleanup_paths):
+            if message:
+                print(message)
 
     if dry_run:
         print("[dry-run] fresh reset complete")
@@ -657,8 +904,22 @@ def cmd_down() -> int:
     return _run([_bash_executable(), "scripts/dev_down.sh"])
 
 
-def cmd_preflight() -> int:
-    return _run([_venv_python(), "scripts/voice_preflight.py"])
+def cmd_preflight(out: TextIO | None = None, err: TextIO | None = None) -> int:
+    command = [_venv_python(), "scripts/voice_preflight.py"]
+    if out is None:
+        return _run(command)
+    completed = subprocess.run(
+        command,
+        cwd=str(ROOT),
+        check=False,
+        env=_env_with_pythonpath(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    out.write(completed.stdout)
+    (err or sys.stderr).write(completed.stderr)
+    return int(completed.returncode)
 
 
 def cmd_test() -> int:
@@ -685,12 +946,18 @@ def cmd_test_ui() -> int:
 
 
 def _wait_for_http(url: str, retries: int = 45, delay_seconds: float = 1.0) -> bool:
+    # Polls go through the shared keep-alive pool, so one socket serves every poll once the
+    # service is listening and later probes in this process (status, doctor) reuse it.
+    import http.client
+
     for _ in range(retries):
         try:
-            with urlopen(url, timeout=1):
+            response = _pooled_request(url, timeout=1)
+            if 200 <= response.status < 400:
                 return True
-        except URLError:
-            time.sleep(delay_seconds)
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(delay_seconds)
     return False
 
 
@@ -699,6 +966,17 @@ def _terminate_process(process: subprocess.Popen[bytes] | subprocess.Popen[str]
         return
     if process.poll() is not None:
         return
+    if os.name == "nt":
+        # E2E children run in their own process group, so Ctrl+Break reaches the whole tree
+        # (npm -> vite, uvicorn workers) and lets it shut down cleanly before we force it.
+        import signal
+
+        try:
+            process.send_signal(signal.CTRL_BREAK_EVENT)
+            process.wait(timeout=10)
+            return
+        except (OSError, subprocess.TimeoutExpired):
+            pass
     process.terminate()
     try:
         process.wait(timeout=10)
@@ -764,6 +1042,7 @@ def _cmd_test_e2e_windows() -> int:
             stdout=gateway_log,
             stderr=subprocess.STDOUT,
             text=True,
+            creationflags=WINDOWS_NEW_PROCESS_GROUP,
         )
         orchestrator_process = subprocess.Popen(
             orchestrator_cmd,
@@ -772,6 +1051,7 @@ def _cmd_test_e2e_windows() -> int:
             stdout=orchestrator_log,
             stderr=subprocess.STDOUT,
             text=True,
+            creationflags=WINDOWS_NEW_PROCESS_GROUP,
         )
         ui_process = subprocess.Popen(
             [npm_exec, "--workspace", "@opencommotion/ui", "run", "dev", "--", "--host", "127.0.0.1", "--port", "5173"],
@@ -780,6 +1060,7 @@ def _cmd_test_e2e_windows() -> int:
             stdout=ui_log,
             stderr=subprocess.STDOUT,
             text=True,
+            creationflags=WINDOWS_NEW_PROCESS_GROUP,
         )
 
         if not _wait_for_http("http://127.0.0.1:8000/health"):
@@ -919,18 +1200,21 @@ def cmd_voice_setup() -> int:
     piper_model = ROOT / PIPER_MODEL_REL
     piper_config = ROOT / PIPER_CONFIG_REL
 
+    archive_path = ROOT / "runtime" / "tools" / "piper" / "piper_windows_amd64.zip"
+    pending: list[tuple[str, Path]] = []
     if not piper_bin.exists():
         print("Installing Piper binary...")
-        archive_path = ROOT / "runtime" / "tools" / "piper" / "piper_windows_amd64.zip"
-        _download_file(PIPER_WINDOWS_URL, archive_path)
-        shutil.unpack_archive(str(archive_path), str(archive_path.parent))
-        archive_path.unlink(missing_ok=True)
-
+        pending.append((PIPER_WINDOWS_URL, archive_path))
     if not piper_model.exists():
         print("Downloading high-quality Piper model...")
-        _download_file(PIPER_MODEL_URL, piper_model)
+        pending.append((PIPER_MODEL_URL, piper_model))
     if not piper_config.exists():
-        _download_file(PIPER_CONFIG_URL, piper_config)
+        pending.append((PIPER_CONFIG_URL, piper_config))
+    _download_files(pending)
+
+    if not piper_bin.exists():
+        shutil.unpack_archive(str(archive_path), str(archive_path.parent))
+        archive_path.unlink(missing_ok=True)
 
     _set_env_values(
         {
@@ -955,7 +1239,7 @@ def cmd_voice_setup() -> int:
 
 
 def _tool_exists(name: str) -> bool:
-    return shutil.which(name) is not None
+    return _which(name) is not None
 
 
 def _remove_windows_firewall_rules() -> None:
@@ -993,35 +1277,59 @@ def _remove_windows_firewall_rules() -> None:
 
 
 def cmd_doctor() -> int:
-    checks: list[tuple[str, bool, str]] = []
-    checks.append(("python3", _tool_exists("python3"), "required"))
-    checks.append(("node", _tool_exists("node"), "required for UI dev/test"))
-    checks.append(("npm", _tool_exists("npm"), "required for UI dev/test"))
-    checks.append(("codex", _tool_exists("codex"), "recommended for codex-cli provider"))
-    checks.append(("openclaw", _tool_exists("openclaw"), "recommended for openclaw-cli provider"))
-    checks.append(("espeak/espeak-ng", _tool_exists("espeak") or _tool_exists("espeak-ng"), "optional local TTS"))
-    checks.append(("piper", _tool_exists("piper"), "optional high-quality local TTS"))
-
-    failures = 0
-    for label, ok, note in checks:
-        state = "ok" if ok else "missing"
-        print(f"{label:15} {state:7} {note}")
-        if label in {"python3"} and not ok:
+    import io
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Voice preflight (a child process) and service status (network probes) are independent of
+    # each other and of the tool lookups, so all three run at once; the first two are buffered
+    # and printed afterwards in the usual order, with preflight errors still going to stderr.
+    preflight_out, preflight_err, status_out = io.StringIO(), io.StringIO(), io.StringIO()
+    with ThreadPoolExecutor(max_workers=2) as background:
+        preflight_future = background.submit(cmd_preflight, preflight_out, preflight_err)
+        status_future = background.submit(cmd_status, status_out)
+
+        tools = [
+            ("python3", ("python3",), "required"),
+            ("node", ("node",), "required for UI dev/test"),
+            ("npm", ("npm",), "required for UI dev/test"),
+            ("codex", ("codex",), "recommended for codex-cli provider"),
+            ("openclaw", ("openclaw",), "recommended for openclaw-cli provider"),
+            ("espeak/espeak-ng", ("espeak", "espeak-ng"), "optional local TTS"),
+            ("piper", ("piper",), "optional high-quality local TTS"),
+        ]
+        # Each lookup stats every PATH entry (times PATHEXT on Windows), so resolve them together.
+        names = [name for _, candidates, _ in tools for name in candidates]
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            found = dict(zip(names, executor.map(_tool_exists, names)))
+        checks = [(label, any(found[name] for name in candidates), note) for label, candidates, note in tools]
+
+        failures = 0
+        for label, ok, note in checks:
+            state = "ok" if ok else "missing"
+            print(f"{label:15} {state:7} {note}")
+            if label in {"python3"} and not ok:
+                failures += 1
+
+        preflight_code = preflight_future.result()
+        status_code = status_future.result()
+
+        print("\nvoice preflight:")
+        sys.stdout.write(preflight_out.getvalue())
+        sys.stdout.flush()
+        sys.stderr.write(preflight_err.getvalue())
+        if preflight_code != 0:
             failures += 1
 
-    print("\nvoice preflight:")
-    preflight_code = cmd_preflight()
-    if preflight_code != 0:
-        failures += 1
-
-    print("\nservice status:")
-    status_code = cmd_status()
-    if status_code != 0:
-        print("stack not running (this is okay if you have not started it yet)")
+        print("\nservice status:")
+        sys.stdout.write(status_out.getvalue())
+        if status_code != 0:
+            print("stack not running (this is okay if you have not started it yet)")
     return 1 if failures else 0
 
 
 def cmd_quickstart() -> int:
+    # Strictly serial: setup runs the wizard with the .venv interpreter that install creates, both
+    # install_local.sh and the wizard write .env, and run's UI freshness check hashes that .env.
     sequence = [
         ("install", cmd_install),
         ("setup", cmd_setup),
@@ -1047,6 +1355,7 @@ def cmd_where() -> int:
     return 0
 
 
+@functools.lru_cache(maxsize=1)
 def _is_standard_install() -> bool:
     """Return True if ROOT looks like the standard install path (~/apps/opencommotion).
 
@@ -1054,13 +1363,28 @@ def _is_standard_install() -> bool:
     silently delete a developer's working clone.
     """
     try:
-        home = Path.home()
-        standard = home / "apps" / "opencommotion"
-        return ROOT.resolve() == standard.resolve()
+        standard = Path.home() / "apps" / "opencommotion"
+        # ROOT is already resolved at import, so only the standard path needs resolving.
+        return ROOT == standard.resolve()
     except Exception:  # noqa: BLE001
         return False
 
 
+def _user_path_mentions(directory: str) -> bool:
+    """Return True if the Windows user-scope PATH contains `directory`, or if it cannot be read."""
+    try:
+        import winreg
+
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment") as key:
+            value, _ = winreg.QueryValueEx(key, "Path")
+    except FileNotFoundError:
+        return False
+    except Exception:  # noqa: BLE001
+        return True
+    # Mirrors the case-insensitive substring test the PowerShell snippet uses.
+    return directory.lower() in str(value).lower()
+
+
 def cmd_uninstall() -> int:
     """Stop the stack, remove launcher shims, then delete the install directory."""
     print("Stopping OpenCommotion stack…")
@@ -1069,17 +1393,30 @@ def cmd_uninstall() -> int:
     removed: list[str] = []
     not_found: list[str] = []
 
+    standard_install = _is_standard_install()
+    install_path = str(ROOT)
+    # Off Windows nothing else runs after the shim removal, so the deferred delete is started
+    # from the same bash process, detached from our pipes so run() does not wait for it.
+    defer_in_shim_shell = standard_install and os.name != "nt"
+    deferred = False
+
     # ── WSL / Linux launcher ──────────────────────────────────────────────────
     bash = _bash_executable()
     if bash is not None:
+        shim_script = (
+            "if [ -f ~/.local/bin/opencommotion ]; then "
+            "rm -f ~/.local/bin/opencommotion && echo removed; "
+            "else echo missing; fi"
+        )
+        if defer_in_shim_shell:
+            delete_cmd = shlex.quote(f"sleep 1; rm -rf {shlex.quote(install_path)}")
+            shim_script += f"; nohup sh -c {delete_cmd} >/dev/null 2>&1 & echo deferred"
         try:
             r = subprocess.run(
-                [bash, "-lc",
-                 "if [ -f ~/.local/bin/opencommotion ]; then "
-                 "rm -f ~/.local/bin/opencommotion && echo removed; "
-                 "else echo missing; fi"],
+                [bash, "-lc", shim_script],
                 capture_output=True, text=True,
             )
+            deferred = "deferred" in r.stdout.split()
             if "removed" in r.stdout:
                 removed.append("~/.local/bin/opencommotion (WSL/Linux)")
             else:
@@ -1106,15 +1443,19 @@ def cmd_uninstall() -> int:
             r"  [Environment]::SetEnvironmentVariable('Path',$clean,'User'); "
             r"  Write-Output 'path-cleaned' } else { Write-Output 'path-unchanged' }"
         )
-        try:
-            pr = subprocess.run(
-                ["powershell.exe", "-NoProfile", "-Command", ps_snippet],
-                capture_output=True, text=True,
-            )
-            if "path-cleaned" in pr.stdout:
-                print("Removed ~/.local/bin from Windows user PATH (restart PowerShell to take effect).")
-        except Exception:  # noqa: BLE001
-            pass
+        # PowerShell costs a few hundred ms to start, so only launch it when the user PATH
+        # actually mentions the shim directory (or the registry could not be read).
+        shim_dir = str(Path(user_profile) / ".local" / "bin") if user_profile else ""
+        if not shim_dir or _user_path_mentions(shim_dir):
+            try:
+                pr = subprocess.run(
+                    ["powershell.exe", "-NoProfile", "-Command", ps_snippet],
+                    capture_output=True, text=True,
+                )
+                if "path-cleaned" in pr.stdout:
+                    print("Removed ~/.local/bin from Windows user PATH (restart PowerShell to take effect).")
+            except Exception:  # noqa: BLE001
+                pass
 
         _remove_windows_firewall_rules()
 
@@ -1125,7 +1466,7 @@ def cmd_uninstall() -> int:
 
     # ── Delete the install directory ──────────────────────────────────────────
     print()
-    if not _is_standard_install():
+    if not standard_install:
         # Running from a dev/custom clone — never auto-delete.
         print(f"Dev workspace detected at {ROOT}")
         print("Directory NOT deleted (only the standard install at ~/apps/opencommotion is auto-removed).")
@@ -1134,9 +1475,11 @@ def cmd_uninstall() -> int:
 
     # Standard install: schedule deferred deletion via a temp script so this
     # Python process can exit cleanly before the directory disappears.
-    install_path = str(ROOT.resolve())
     print(f"Scheduling deletion of install directory: {install_path}")
-    if bash is not None:
+    if deferred:
+        print("Install directory will be deleted in ~1 second.")
+        print("Uninstall complete. You can close this terminal.")
+    elif bash is not None:
         # Escape path for shell safety
         safe_path = install_path.replace("'", "'\\''")
         defer_cmd = f"sleep 1; rm -rf '{safe_path}'; echo 'OpenCommotion uninstalled.'"
@@ -1158,18 +1501,82 @@ def cmd_uninstall() -> int:
     return 0
 
 
+def _pooled_request(
+    url: str, timeout: float, connect_timeout: float | None = None, method: str = "GET"
+) -> http.client.HTTPResponse:
+    # Keep-alive connections are pooled per (scheme, host, port) so repeated probes in one
+    # process (stack detection, status, doctor) reuse sockets; a connection is only ever
+    # used by one thread at a time.
+    import http.client
+
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.hostname or "127.0.0.1", parts.port)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    while True:
+        with _HTTP_POOL_LOCK:
+            idle = _HTTP_POOL.get(key)
+            connection = idle.pop() if idle else None
+        reused = connection is not None
+        try:
+            if connection is None:
+                # Connect under the short budget so a dead port fails fast, then give the
+                # established socket the full read timeout.
+                connection_cls = http.client.HTTPSConnection if key[0] == "https" else http.client.HTTPConnection
+                connection = connection_cls(key[1], key[2], timeout=connect_timeout or timeout)
+                connection.connect()
+                connection.timeout = timeout
+                connection.sock.settimeout(timeout)
+            connection.request(method, path)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            if reused:
+                # The server dropped an idle keep-alive socket; retry on a fresh one.
+                continue
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            with _HTTP_POOL_LOCK:
+                _HTTP_POOL.setdefault(key, []).append(connection)
+        return response
+
+
 def _check_url(url: str) -> tuple[bool, str]:
+    # HEAD skips the body; servers that predate HEAD on /health answer 405 once and are then
+    # probed with GET for the rest of the process.
+    parts = urlsplit(url)
+    origin = (parts.scheme, parts.hostname or "127.0.0.1", parts.port)
+    method = "GET" if origin in _HEAD_UNSUPPORTED else "HEAD"
     try:
-        with urlopen(url, timeout=2) as response:
-            return True, f"{response.status}"
-    except URLError as exc:
-        return False, str(exc.reason)
+        response = _pooled_request(url, timeout=PROBE_READ_TIMEOUT_S, connect_timeout=PROBE_CONNECT_TIMEOUT_S, method=method)
+        if method == "HEAD" and response.status in (405, 501):
+            _HEAD_UNSUPPORTED.add(origin)
+            response = _pooled_request(url, timeout=PROBE_READ_TIMEOUT_S, connect_timeout=PROBE_CONNECT_TIMEOUT_S)
     except Exception as exc:  # noqa: BLE001
         return False, str(exc)
+    if response.status >= 400:
+        return False, response.reason
+    return True, f"{response.status}"
+
 
+def _check_urls(urls: list[str]) -> list[tuple[bool, str]]:
+    # Probes are socket-bound and hold the GIL only briefly, so a bounded thread pool covers any
+    # realistic number of endpoints without an async HTTP dependency; results keep input order.
+    if not urls:
+        return []
+    from concurrent.futures import ThreadPoolExecutor
 
-def cmd_status() -> int:
-    print(f"{_project_identity()} @ {ROOT}")
+    with ThreadPoolExecutor(max_workers=min(len(urls), PROBE_MAX_WORKERS)) as executor:
+        return list(executor.map(_check_url, urls))
+
+
+def cmd_status(out: TextIO | None = None) -> int:
+    out = out or sys.stdout
+    print(f"{_project_identity()} @ {ROOT}", file=out, flush=True)
     gw_port, orch_port = _read_dev_ports()
     checks: list[tuple[str, str]] = [
         ("gateway (run)",      "http://127.0.0.1:8000/health"),
@@ -1181,17 +1588,52 @@ def cmd_status() -> int:
     if orch_port and orch_port not in (8000, 8001):
         checks.append((f"orch (dev:{orch_port})", f"http://127.0.0.1:{orch_port}/health"))
 
-    failures = 0
-    for label, url in checks:
-        ok, detail = _check_url(url)
-        state = "ok" if ok else "down"
-        print(f"{label:22} {state:4} {url} ({detail})")
-        if not ok:
-            failures += 1
+    results = _check_urls([url for _, url in checks])
+
+    rows = [
+        f"{label:22} {'ok' if ok else 'down':4} {url} ({detail})"
+        for (label, url), (ok, detail) in zip(checks, results)
+    ]
+    out.write("\n".join(rows) + "\n")
+    failures = sum(1 for ok, _ in results if not ok)
     return 0 if failures == 0 else 1
 
 
+COMMAND_HANDLERS: dict[str, Callable[[], int]] = {
+    "install": cmd_install,
+    "setup": cmd_setup,
+    "run": cmd_run,
+    "dev": cmd_dev,
+    "update": cmd_update,
+    "fresh": cmd_fresh,
+    "down": cmd_down,
+    "preflight": cmd_preflight,
+    "status": cmd_status,
+    "test": cmd_test,
+    "test-ui": cmd_test_ui,
+    "test-e2e": cmd_test_e2e,
+    "test-complete": cmd_test_complete,
+    "fresh-agent-e2e": cmd_fresh_agent_e2e,
+    "voice-setup": cmd_voice_setup,
+    "doctor": cmd_doctor,
+    "quickstart": cmd_quickstart,
+    "version": cmd_version,
+    "where": cmd_where,
+    "uninstall": cmd_uninstall,
+}
+COMMANDS = tuple(COMMAND_HANDLERS)
+# Every command also accepts a single-dash flag spelling; extra spellings are listed here.
+COMMAND_EXTRA_FLAGS = {"down": ("-stop",)}
+COMMAND_FLAG_ALIASES = {
+    flag: command for command in COMMANDS for flag in (f"-{command}", *COMMAND_EXTRA_FLAGS.get(command, ()))
+}
+# argparse stores each flag under its dest name; precomputed so selection is plain getattr calls.
+_FLAG_ATTRS = tuple((flag.lstrip("-").replace("-", "_"), command) for flag, command in COMMAND_FLAG_ALIASES.items())
+
+
 def build_parser() -> argparse.ArgumentParser:
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="opencommotion",
         description="OpenCommotion no-make CLI.",
@@ -1212,69 +1654,38 @@ def build_parser() -> argparse.ArgumentParser:
 
 
 def _selected_command(args: argparse.Namespace, parser: argparse.ArgumentParser) -> str | None:
-    selected: list[str] = []
-    if args.command:
-        selected.append(args.command)
-    for flag, command in COMMAND_FLAG_ALIASES.items():
-        attr = flag.lstrip("-").replace("-", "_")
-        if getattr(args, attr, False):
-            selected.append(command)
-    unique = sorted(set(selected))
-    if not unique:
+    selected = [args.command] if args.command else []
+    selected.extend(command for attr, command in _FLAG_ATTRS if getattr(args, attr, False))
+    if not selected:
         parser.print_help()
         return None
-    if len(unique) > 1:
-        parser.error(f"Choose one command at a time; got: {', '.join(unique)}")
-    return unique[0]
+    first = selected[0]
+    if len(selected) > 1 and any(command != first for command in selected):
+        parser.error(f"Choose one command at a time; got: {', '.join(sorted(set(selected)))}")
+    return first
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_parser() -> argparse.ArgumentParser:
+    # Built on first use rather than at import: every CLI run pays for it exactly once either way,
+    # and importers (tests, other scripts) that never call main() pay nothing.
+    return build_parser()
 
 
 def main() -> int:
-    parser = build_parser()
+    argv = sys.argv[1:]
+    if len(argv) == 1:
+        # A lone command or flag alias is unambiguous, so argparse is only built for help, errors
+        # and abbreviated flags.
+        handler = COMMAND_HANDLERS.get(COMMAND_FLAG_ALIASES.get(argv[0], argv[0]))
+        if handler is not None:
+            return handler()
+    parser = _shared_parser()
     args = parser.parse_args()
     command = _selected_command(args, parser)
     if command is None:
         return 2
-    if command == "install":
-        return cmd_install()
-    if command == "setup":
-        return cmd_setup()
-    if command == "run":
-        return cmd_run()
-    if command == "dev":
-        return cmd_dev()
-    if command == "update":
-        return cmd_update()
-    if command == "fresh":
-        return cmd_fresh()
-    if command == "down":
-        return cmd_down()
-    if command == "preflight":
-        return cmd_preflight()
-    if command == "status":
-        return cmd_status()
-    if command == "test":
-        return cmd_test()
-    if command == "test-ui":
-        return cmd_test_ui()
-    if command == "test-e2e":
-        return cmd_test_e2e()
-    if command == "test-complete":
-        return cmd_test_complete()
-    if command == "fresh-agent-e2e":
-        return cmd_fresh_agent_e2e()
-    if command == "voice-setup":
-        return cmd_voice_setup()
-    if command == "doctor":
-        return cmd_doctor()
-    if command == "quickstart":
-        return cmd_quickstart()
-    if command == "version":
-        return cmd_version()
-    if command == "where":
-        return cmd_where()
-    if command == "uninstall":
-        return cmd_uninstall()
-    return 2
+    return COMMAND_HANDLERS[command]()
 
 
 if __name__ == "__main__":
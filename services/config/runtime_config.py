@@ -69,6 +69,9 @@ VALID_TTS_ENGINES = {"auto", "piper", "espeak", "openai-compatible", "tone-fallb
 VALID_AUTH_MODES = {"api-key", "network-trust"}
 LOCAL_VOICE_HOSTS = {"127.0.0.1", "localhost", "0.0.0.0", "::1"}
 
+# Parsed .env files keyed by path, reused while (st_mtime_ns, st_size) is unchanged.
+_ENV_CACHE: dict[Path, tuple[tuple[int, int], dict[str, str]]] = {}
+
 
 def _voice_api_key_required(base_url: str) -> bool:
     parsed = urlparse(base_url)
@@ -79,8 +82,15 @@ def _voice_api_key_required(base_url: str) -> bool:
 
 
 def parse_env(path: Path) -> dict[str, str]:
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        _ENV_CACHE.pop(path, None)
         return {}
+    fingerprint = (stat.st_mtime_ns, stat.st_size)
+    cached = _ENV_CACHE.get(path)
+    if cached is not None and cached[0] == fingerprint:
+        return dict(cached[1])
     values: dict[str, str] = {}
     for raw in path.read_text(encoding="utf-8").splitlines():
         line = raw.strip()
@@ -88,10 +98,15 @@ def parse_env(path: Path) -> dict[str, str]:
             continue
         key, value = line.split("=", 1)
         values[key.strip()] = value.strip()
-    return values
+    _ENV_CACHE[path] = (fingerprint, values)
+    return dict(values)
+
+
+def flush_env_cache() -> None:
+    _ENV_CACHE.clear()
 
 
-def write_env(path: Path, payload: dict[str, str]) -> None:
+def write_env(path: Path, payload: dict[str, str]) -> bool:
     ordered_keys: list[str] = []
     if ENV_EXAMPLE_PATH.exists():
         for raw in ENV_EXAMPLE_PATH.read_text(encoding="utf-8").splitlines():
@@ -107,7 +122,16 @@ def write_env(path: Path, payload: dict[str, str]) -> None:
             ordered_keys.append(key)
 
     lines = [f"{key}={payload.get(key, '')}" for key in ordered_keys]
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    encoded = ("\n".join(lines) + "\n").encode("utf-8")
+    try:
+        if path.read_bytes() == encoded:
+            # Leave mtime alone so .env watchers and the parse cache are not disturbed.
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(encoded)
+    _ENV_CACHE.pop(path, None)
+    return True
 
 
 def masked_state(values: dict[str, str]) -> dict[str, str]:
@@ -198,6 +222,7 @@ def validate_setup(values: dict[str, str]) -> dict[str, Any]:
 __all__ = [
     "ENV_PATH",
     "EDITABLE_KEYS",
+    "flush_env_cache",
     "masked_state",
     "normalized_editable",
     "parse_env",
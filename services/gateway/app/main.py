@@ -1050,7 +1050,7 @@ async def shutdown_event() -> None:
     await manager.stop()
 
 
-@app.get("/health")
+@app.api_route("/health", methods=["GET", "HEAD"])
 def health() -> dict:
     return {
         "status": "ok",
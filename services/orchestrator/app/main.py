@@ -85,7 +85,7 @@ async def metrics_middleware(request, call_next):  # type: ignore[override]
     return response
 
 
-@app.get("/health")
+@app.api_route("/health", methods=["GET", "HEAD"])
 def health() -> dict:
     return {
         "status": "ok",
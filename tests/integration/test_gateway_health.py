@@ -10,6 +10,13 @@ def test_gateway_health() -> None:
     assert res.json()['service'] == 'gateway'
 
 
+def test_gateway_health_answers_head() -> None:
+    c = TestClient(app)
+    res = c.head('/health')
+    assert res.status_code == 200
+    assert res.content == b''
+
+
 def test_gateway_serves_ui_index_when_dist_available() -> None:
     c = TestClient(app)
     res = c.get("/")
@@ -8,3 +8,10 @@ def test_orchestrator_health() -> None:
     res = c.get('/health')
     assert res.status_code == 200
     assert res.json()['service'] == 'orchestrator'
+
+
+def test_orchestrator_health_answers_head() -> None:
+    c = TestClient(app)
+    res = c.head('/health')
+    assert res.status_code == 200
+    assert res.content == b''
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / "scripts" / "opencommotion.py"
+
+
+@pytest.fixture()
+def cli(monkeypatch, tmp_path):
+    spec = importlib.util.spec_from_file_location("opencommotion_cli_under_test", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "ROOT", tmp_path)
+    return module
+
+
+def test_venv_python_follows_venv_creation_and_removal(cli, tmp_path) -> None:
+    if sys.platform == "win32":
+        pytest.skip("posix venv layout")
+    assert cli._venv_python() == sys.executable
+
+    venv_python = tmp_path / ".venv" / "bin" / "python"
+    venv_python.parent.mkdir(parents=True)
+    venv_python.write_text("", encoding="utf-8")
+    assert cli._venv_python() == str(venv_python)
+
+    venv_python.unlink()
+    assert cli._venv_python() == sys.executable
+
+
+def test_read_dev_ports_follows_ports_file(cli, tmp_path) -> None:
+    assert cli._read_dev_ports() == (0, 0)
+
+    ports_file = tmp_path / "runtime" / "agent-runs" / "ports.env"
+    ports_file.parent.mkdir(parents=True)
+    ports_file.write_text("GATEWAY_PORT=8100\nORCHESTRATOR_PORT=8101\n", encoding="utf-8")
+    assert cli._read_dev_ports() == (8100, 8101)
+
+    ports_file.write_text("GATEWAY_PORT=8200\nORCHESTRATOR_PORT=8201\n", encoding="utf-8")
+    assert cli._read_dev_ports() == (8200, 8201)
+
+
+def test_invalidate_project_identity_rereads_version(cli, tmp_path) -> None:
+    package_path = tmp_path / "package.json"
+    package_path.write_text(json.dumps({"version": "1.0.0"}), encoding="utf-8")
+    assert cli._project_version() == "1.0.0"
+
+    package_path.write_text(json.dumps({"version": "1.1.0"}), encoding="utf-8")
+    assert cli._project_version() == "1.0.0"
+
+    cli._invalidate_project_identity()
+    assert cli._project_version() == "1.1.0"
+
+
+def test_corrupt_marker_digests_are_rehashed(cli, monkeypatch, tmp_path) -> None:
+    source = tmp_path / "main.ts"
+    source.write_text("export const a = 1;\n", encoding="utf-8")
+    marker = tmp_path / "ui-build.marker"
+    monkeypatch.setattr(cli, "UI_BUILD_MARKER", marker)
+    monkeypatch.setattr(cli, "_ui_rel", lambda path: path.name)
+
+    expected_hash, expected_digests = cli._ui_source_hash([source])
+    marker.write_text(
+        json.dumps({"hash": expected_hash, "files": {}, "digests": {"main.ts": "not-hex", "other.ts": "ab"}}),
+        encoding="utf-8",
+    )
+
+    _, _, digests = cli._read_build_marker()
+    assert digests == {}
+    assert cli._ui_source_hash([source], digests) == (expected_hash, expected_digests)
+
+
+def test_env_with_pythonpath_returns_independent_copies(cli) -> None:
+    first = cli._env_with_pythonpath()
+    first["OPENCOMMOTION_TEST_ONLY_VAR"] = "1"
+    assert "OPENCOMMOTION_TEST_ONLY_VAR" not in cli._env_with_pythonpath()
+
+
+def test_build_marker_round_trip_and_staleness(cli, monkeypatch, tmp_path) -> None:
+    source = tmp_path / "main.ts"
+    source.write_text("export const a = 1;\n", encoding="utf-8")
+    monkeypatch.setattr(cli, "UI_BUILD_MARKER", tmp_path / "ui-build.marker")
+    monkeypatch.setattr(cli, "_ui_rel", lambda path: path.name)
+
+    source_hash, digests = cli._ui_source_hash([source])
+    stat_map = cli._ui_stat_map([source])
+    cli._write_build_marker(source_hash, stat_map, digests)
+    assert cli._read_build_marker() == (source_hash, stat_map, digests)
+
+    source.write_text("export const a = 2;\n", encoding="utf-8")
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cli._ui_stat_map([source]) != stat_map
+    assert cli._ui_source_hash([source])[0] != source_hash
+
+
+def test_check_url_falls_back_to_get_when_head_is_rejected(cli) -> None:
+    methods: list[str] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int) -> None:
+            methods.append(self.command)
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_HEAD(self) -> None:  # noqa: N802
+            self._reply(405)
+
+        def do_GET(self) -> None:  # noqa: N802
+            self._reply(200)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/health"
+        assert cli._check_url(url) == (True, "200")
+        assert cli._check_url(url) == (True, "200")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert methods == ["HEAD", "GET", "GET"]
+
+
+def test_lone_token_dispatch_matches_parser(cli, monkeypatch) -> None:
+    called: list[str] = []
+    handlers = {command: (lambda command=command: called.append(command) or 0) for command in cli.COMMANDS}
+    monkeypatch.setattr(cli, "COMMAND_HANDLERS", handlers)
+    parser = cli.build_parser()
+
+    tokens = [*cli.COMMANDS, *cli.COMMAND_FLAG_ALIASES]
+    for token in tokens:
+        monkeypatch.setattr(sys, "argv", ["opencommotion", token])
+        assert cli.main() == 0
+        assert called.pop() == cli._selected_command(parser.parse_args([token]), parser)
+
+
+def test_env_delta_rereads_changed_env_file(cli, tmp_path) -> None:
+    env_path = tmp_path / ".env"
+    env_path.write_text("OPENCOMMOTION_TEST_ONLY_KEY=one\n", encoding="utf-8")
+    assert cli._env_delta()["OPENCOMMOTION_TEST_ONLY_KEY"] == "one"
+    assert cli._env_with_pythonpath()["OPENCOMMOTION_TEST_ONLY_KEY"] == "one"
+
+    env_path.write_text("OPENCOMMOTION_TEST_ONLY_KEY=two\n", encoding="utf-8")
+    stat = env_path.stat()
+    os.utime(env_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cli._env_delta()["OPENCOMMOTION_TEST_ONLY_KEY"] == "two"
+    assert cli._env_with_pythonpath()["OPENCOMMOTION_TEST_ONLY_KEY"] == "two"
+
+    env_path.unlink()
+    assert "OPENCOMMOTION_TEST_ONLY_KEY" not in cli._env_delta()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+
+from services.config.runtime_config import flush_env_cache, parse_env, write_env
+
+
+def test_parse_env_reuses_parse_until_file_changes(tmp_path) -> None:
+    flush_env_cache()
+    env_path = tmp_path / ".env"
+    env_path.write_text("A=1\n# comment\nB = two \n", encoding="utf-8")
+
+    first = parse_env(env_path)
+    assert first == {"A": "1", "B": "two"}
+
+    first["A"] = "mutated"
+    assert parse_env(env_path) == {"A": "1", "B": "two"}
+
+    env_path.write_text("A=3\n", encoding="utf-8")
+    stat = env_path.stat()
+    os.utime(env_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert parse_env(env_path) == {"A": "3"}
+
+    write_env(env_path, {"A": "4"})
+    assert parse_env(env_path)["A"] == "4"
+
+    env_path.unlink()
+    assert parse_env(env_path) == {}
+
+
+def test_write_env_skips_identical_content(tmp_path) -> None:
+    env_path = tmp_path / ".env"
+    assert write_env(env_path, {"ZZ_KEY": "1"}) is True
+    before = env_path.stat().st_mtime_ns
+    assert write_env(env_path, {"ZZ_KEY": "1"}) is False
+    assert env_path.stat().st_mtime_ns == before
+    assert write_env(env_path, {"ZZ_KEY": "2"}) is True
+    assert parse_env(env_path)["ZZ_KEY"] == "2"